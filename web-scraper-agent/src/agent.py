@@ -28,9 +28,9 @@ from src.utils.retry_manager import RetryManager
 from src.utils.recovery_manager import RecoveryManager
 from src.utils.error_detector import ProactiveErrorDetector
 from src.frameworks.detector import FrameworkDetector
-from src.frameworks.executors import PlaywrightExecutor, ScrapyExecutor, BrowserUseExecutor  # Added BrowserUseExecutor
+from src.frameworks.executors import PlaywrightExecutor, ScrapyExecutor, AgentBrowserUseExecutor
 from src.validators.script_validator import ScriptValidator
-from src.utils.rate_limiter import RateLimiter
+from src.utils.rate_limiter import RateLimiter, _extract_domain
 # from src.utils.privacy_filter import PrivacyFilter
 from src.utils.secure_session import SecureSessionStorage
 
@@ -222,7 +222,9 @@ if __name__ == "__main__":
                     "critical": True
                 })
 
-            self.state.attempt_history.append({"plan": steps, "framework": framework})
+            # Snapshot the plan so values the executor attaches later (resolved fill values,
+            # extracted data) never end up in the next prompt
+            self.state.attempt_history.append({"plan": [dict(s) for s in steps], "framework": framework})
             return steps
         except Exception as e:
             logger.warning("Bad JSON from LLM – fallback: {}", e)
@@ -271,7 +273,7 @@ Return a JSON array of steps only, no outer object.
                 steps = parsed["plan"]
             else:
                 steps = parsed if isinstance(parsed, list) else []
-            self.state.attempt_history.append({"feedback": feedback, "new_plan": steps})
+            self.state.attempt_history.append({"feedback": feedback, "new_plan": [dict(s) for s in steps if isinstance(s, dict)]})
             return steps
         except:
             logger.warning("Replan failed – using fallback")
@@ -678,7 +680,7 @@ Return a JSON array of steps only, no outer object.
                 # Store crawl delay for use in execution
                 self.crawl_delay = crawl_delay
                 # Set rate limiter delay for this domain
-                domain = urlparse(url).netloc
+                domain = _extract_domain(url)
                 self.rate_limiter.set_domain_delay(domain, crawl_delay)
 
             # Check specific paths we might access
@@ -732,6 +734,7 @@ Return a JSON array of steps only, no outer object.
                 user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
                 viewport={"width": 1920, "height": 1080}
             )
+            await self.detector.install_tech_probe(context)  # detect() and tech_info both probe this page
             domain = self.state.url.split("//")[-1].split("/")[0]
             session_data = self.secure_sessions.load_session(domain)
             if session_data:
@@ -861,7 +864,7 @@ Return a JSON array of steps only, no outer object.
             browser = None
             try:
                 if self.state.framework == "browser-use":
-                    extracted_data = await BrowserUseExecutor.execute_steps(self.state.url, self.state.task, steps)
+                    extracted_data = await AgentBrowserUseExecutor.execute_steps(self.state.url, self.state.task, steps)
                 else:
                     browser = await self.pool.get()
                     page = await browser.new_page()
@@ -997,7 +1000,7 @@ Return a JSON array of steps only, no outer object.
                 script_path = script_dir / "spider.py"
                 script_path.write_text(script)
             elif self.state.framework == "browser-use":
-                script = BrowserUseExecutor.generate_code(self.state.url, self.state.task, steps)
+                script = AgentBrowserUseExecutor.generate_code(self.state.url, self.state.task, steps)
                 script_path = script_dir / "main.py"
                 script_path.write_text(script)
             else:
@@ -1019,7 +1022,7 @@ Return a JSON array of steps only, no outer object.
 
             # 6. Validate & Test
             logger.info("Validating generated script: {}", script_path)
-            valid, error = self.validator.check_syntax(script_path)
+            valid, error = await self.validator.check_syntax(script_path)
             if not valid:
                 logger.warning("⚠️  Syntax error: {}", error)
                 logger.warning("Script syntax invalid: {}", error)
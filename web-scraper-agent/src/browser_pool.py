@@ -1,7 +1,27 @@
-from playwright.async_api import async_playwright, Browser
+import os
+from playwright.async_api import async_playwright, Browser, Playwright
 from loguru import logger
 from playwright_stealth.stealth import Stealth
 
+
+async def get_browser(p: Playwright) -> Browser:
+    """
+    Attach to an already running Chromium when CHROMIUM_CDP_URL is set
+    (e.g. http://localhost:9222), skipping the cold start; otherwise, or if
+    it can't be reached, launch a headless one. close() on an attached
+    browser only disconnects, so the warm instance survives the run.
+    """
+    cdp_url = os.getenv("CHROMIUM_CDP_URL")
+    if cdp_url:
+        try:
+            browser = await p.chromium.connect_over_cdp(cdp_url, timeout=5000)
+            logger.debug("Attached to warm Chromium at {}", cdp_url)
+            return browser
+        except Exception as e:
+            logger.warning("⚠️  Could not attach to Chromium at {} ({}), launching a new one", cdp_url, e)
+    return await p.chromium.launch(headless=True)
+
+
 class BrowserPool:
     def __init__(self, size: int = 3):
         self.size = size
@@ -1,10 +1,99 @@
 # src/frameworks/detector.py
-from playwright.async_api import Page
+from playwright.async_api import Page, BrowserContext
 from loguru import logger
+import asyncio
 import re
+import weakref
 from Wappalyzer import Wappalyzer, WebPage
 
 class FrameworkDetector:
+    # JavaScript-based tech detection, evaluated against the current DOM
+    _TECH_PROBE_JS = """() => ({
+        // Framework globals
+        react: !!window.__REACT_DEVTOOLS_GLOBAL_HOOK__ || !!window.React,
+        vue: !!window.__VUE__ || !!window.Vue,
+        angular: !!window.angular || !!window.ng,
+        svelte: !!window.__SVELTE__,
+        ember: !!window.Ember,
+        backbone: !!window.Backbone,
+        knockout: !!window.ko,
+        polymer: !!window.Polymer,
+
+        // Enhanced React detection for SSR and hydrated apps
+        react_components: !!document.querySelector('[data-reactroot], [data-reactid], [data-react-class]'),
+        react_hydrated: !!document.querySelector('._reactRoot, .react-root, [data-reactroot]'),
+
+        // SSR markers
+        nextjs: !!window.__NEXT_DATA__,
+        nuxt: !!window.__NUXT__,
+        gatsby: !!window.__GATSBY__,
+        vue_ssr: !!window.__VUE_SSR_CONTEXT__,
+
+        // State management
+        redux: !!window.__REDUX_DEVTOOLS_EXTENSION__,
+        vuex: !!window.__VUE_DEVTOOLS_GLOBAL_HOOK__,
+
+        // Build tools
+        webpack: !!window.webpackJsonp,
+        vite: !!window.__vite__,
+
+        // Content analysis
+        script_count: document.querySelectorAll('script').length,
+        link_count: document.querySelectorAll('a').length,
+        form_count: document.querySelectorAll('form').length,
+        api_scripts: document.querySelectorAll('script[src*="api"], script[src*="graphql"]').length,
+
+        // Dynamic content indicators
+        has_event_listeners: document.querySelectorAll('[onclick], [onchange], [onsubmit]').length > 0,
+        has_dynamic_classes: document.querySelectorAll('[class*="active"], [class*="show"], [class*="hide"]').length > 0,
+
+        // Bot protection indicators (enhanced)
+        has_recaptcha: !!document.querySelector('[class*="recaptcha"], [id*="recaptcha"]'),
+        has_cloudflare: !!document.querySelector('script[src*="cloudflare"]') || !!document.querySelector('[id*="cf-"]'),
+        has_akamai: !!document.querySelector('script[src*="akamai"]'),
+        has_perimeterx: !!document.querySelector('script[src*="perimeterx"]') || !!document.querySelector('[id*="px-"]'),
+        has_imperva: !!document.querySelector('script[src*="imperva"]'),
+
+        // Ghost CMS indicators
+        ghost_data_attrs: document.querySelectorAll('[data-ghost]').length > 0,
+        ghost_api_endpoints: document.querySelectorAll('script[src*="/ghost/api/"], script[src*="/members/api/"]').length > 0,
+        ghost_classes: document.querySelectorAll('[class*="ghost"], [class*="post-full"], [class*="kg-"]').length > 0,
+
+        // Additional CMS indicators
+        has_cms_meta: !!document.querySelector('meta[name="generator"][content*="wordpress"], meta[name="generator"][content*="drupal"], meta[name="generator"][content*="joomla"]'),
+        has_wp_content: document.querySelectorAll('script[src*="wp-content"], link[href*="wp-content"]').length > 0,
+    })"""
+
+    # Registers the probe as a hidden window.__techProbe at document start, so
+    # analysis only sends a short call instead of the whole probe source
+    TECH_PROBE_INIT_JS = (
+        "Object.defineProperty(window, '__techProbe', {value: "
+        + _TECH_PROBE_JS
+        + ", configurable: true});"
+    )
+    _TECH_PROBE_CALL_JS = "() => typeof window.__techProbe === 'function' ? window.__techProbe() : null"
+
+    # Contexts that already carry TECH_PROBE_INIT_JS
+    _probe_contexts = weakref.WeakSet()
+
+    @staticmethod
+    async def install_tech_probe(context: BrowserContext) -> None:
+        """Pre-inject the tech probe into every page the context opens from now on."""
+        if context in FrameworkDetector._probe_contexts:
+            return
+        await context.add_init_script(FrameworkDetector.TECH_PROBE_INIT_JS)
+        FrameworkDetector._probe_contexts.add(context)
+
+    @staticmethod
+    async def _probe_page(page: Page) -> dict:
+        """Run the tech probe: the pre-injected copy if present, else the full source."""
+        if page.context in FrameworkDetector._probe_contexts:
+            flags = await page.evaluate(FrameworkDetector._TECH_PROBE_CALL_JS)
+            if flags is not None:
+                return flags
+            # Document predates the init script (or the page replaced it)
+        return await page.evaluate(FrameworkDetector._TECH_PROBE_JS)
+
     @staticmethod
     async def detect(page: Page, html_size: int = 0) -> str:
         """
@@ -39,6 +128,13 @@ class FrameworkDetector:
             logger.warning(f"Tech detection failed, falling back to playwright: {e}")
             return "playwright"
     
+    @staticmethod
+    def _run_wappalyzer(url: str):
+        """Run Wappalyzer against the URL (blocking)."""
+        wappalyzer = Wappalyzer.latest()  # Initialize Wappalyzer
+        webpage = WebPage.new_from_url(url)
+        return wappalyzer.analyze(webpage)
+
     @staticmethod
     async def _analyze_tech_stack(page: Page) -> dict:
         """
@@ -47,83 +143,25 @@ class FrameworkDetector:
         try:
             # Get page content and headers
             url = page.url
-            response = await page.request.get(url)
+            # Headers and rendered HTML are independent round trips; fetch them together
+            response, content = await asyncio.gather(page.request.get(url), page.content())
             headers = dict(response.headers) if response else {}
-            content = await page.content()
         except Exception as e:
             logger.warning(f"Failed to fetch page content/headers: {e}")
             return {"error": "fetch_failed"}
         
-        try:
-            # Wappalyzer analysis
+        # Wappalyzer (blocking HTTP fetch, run in a worker thread) and the
+        # JavaScript-based detection don't depend on each other; run them concurrently
+        wappalyzer_results, js_flags = await asyncio.gather(
+            asyncio.to_thread(FrameworkDetector._run_wappalyzer, url),
+            FrameworkDetector._probe_page(page),
+            return_exceptions=True,
+        )
+        if isinstance(wappalyzer_results, Exception):
+            logger.warning(f"Wappalyzer failed: {wappalyzer_results}")
             wappalyzer_results = {}
-            try:
-                wappalyzer = Wappalyzer.latest()  # Initialize Wappalyzer
-                webpage = WebPage.new_from_url(url)
-                wappalyzer_results = wappalyzer.analyze(webpage)
-            except Exception as e:
-                logger.warning(f"Wappalyzer failed: {e}")
-
-            # JavaScript-based detection
-            js_flags = await page.evaluate(
-                """() => ({
-                    // Framework globals
-                    react: !!window.__REACT_DEVTOOLS_GLOBAL_HOOK__ || !!window.React,
-                    vue: !!window.__VUE__ || !!window.Vue,
-                    angular: !!window.angular || !!window.ng,
-                    svelte: !!window.__SVELTE__,
-                    ember: !!window.Ember,
-                    backbone: !!window.Backbone,
-                    knockout: !!window.ko,
-                    polymer: !!window.Polymer,
-
-                    // Enhanced React detection for SSR and hydrated apps
-                    react_components: !!document.querySelector('[data-reactroot], [data-reactid], [data-react-class]'),
-                    react_hydrated: !!document.querySelector('._reactRoot, .react-root, [data-reactroot]'),
-                    
-                    // SSR markers
-                    nextjs: !!window.__NEXT_DATA__,
-                    nuxt: !!window.__NUXT__,
-                    gatsby: !!window.__GATSBY__,
-                    vue_ssr: !!window.__VUE_SSR_CONTEXT__,
-                    
-                    // State management
-                    redux: !!window.__REDUX_DEVTOOLS_EXTENSION__,
-                    vuex: !!window.__VUE_DEVTOOLS_GLOBAL_HOOK__,
-                    
-                    // Build tools
-                    webpack: !!window.webpackJsonp,
-                    vite: !!window.__vite__,
-                    
-                    // Content analysis
-                    script_count: document.querySelectorAll('script').length,
-                    link_count: document.querySelectorAll('a').length,
-                    form_count: document.querySelectorAll('form').length,
-                    api_scripts: document.querySelectorAll('script[src*="api"], script[src*="graphql"]').length,
-                    
-                    // Dynamic content indicators
-                    has_event_listeners: document.querySelectorAll('[onclick], [onchange], [onsubmit]').length > 0,
-                    has_dynamic_classes: document.querySelectorAll('[class*="active"], [class*="show"], [class*="hide"]').length > 0,
-                    
-                    // Bot protection indicators (enhanced)
-                    has_recaptcha: !!document.querySelector('[class*="recaptcha"], [id*="recaptcha"]'),
-                    has_cloudflare: !!document.querySelector('script[src*="cloudflare"]') || !!document.querySelector('[id*="cf-"]'),
-                    has_akamai: !!document.querySelector('script[src*="akamai"]'),
-                    has_perimeterx: !!document.querySelector('script[src*="perimeterx"]') || !!document.querySelector('[id*="px-"]'),
-                    has_imperva: !!document.querySelector('script[src*="imperva"]'),
-                    
-                    // Ghost CMS indicators
-                    ghost_data_attrs: document.querySelectorAll('[data-ghost]').length > 0,
-                    ghost_api_endpoints: document.querySelectorAll('script[src*="/ghost/api/"], script[src*="/members/api/"]').length > 0,
-                    ghost_classes: document.querySelectorAll('[class*="ghost"], [class*="post-full"], [class*="kg-"]').length > 0,
-                    
-                    // Additional CMS indicators
-                    has_cms_meta: !!document.querySelector('meta[name="generator"][content*="wordpress"], meta[name="generator"][content*="drupal"], meta[name="generator"][content*="joomla"]'),
-                    has_wp_content: document.querySelectorAll('script[src*="wp-content"], link[href*="wp-content"]').length > 0,
-                })"""
-            )
-        except Exception as e:
-            logger.warning(f"JavaScript evaluation failed: {e}")
+        if isinstance(js_flags, Exception):
+            logger.warning(f"JavaScript evaluation failed: {js_flags}")
             js_flags = {}
         
         try:
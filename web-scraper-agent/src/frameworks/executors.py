@@ -7,6 +7,7 @@ from ..content_saver import save
 from ..utils.paginator import Paginator
 from browser_use import Agent, Browser, Controller
 import os
+import weakref
 
 
 class PlaywrightExecutor:
@@ -93,61 +94,32 @@ class PlaywrightExecutor:
         """
     }
 
+    # Exposes the extraction functions as window.__extract*Data. Installed once per page
+    # (add_init_script) so extract calls only send a short call expression.
+    EXTRACTORS_INIT_JS = (
+        "(() => {"
+        + EXTRACTION_FUNCTIONS["spa"]
+        + EXTRACTION_FUNCTIONS["static"]
+        + EXTRACTION_FUNCTIONS["traditional"]
+        + """
+        window.__extractSPAData = extractSPAData;
+        window.__extractStaticData = extractStaticData;
+        window.__extractTraditionalData = extractTraditionalData;
+        })()"""
+    )
+
+    # Pages that already have the extraction functions installed
+    _extractor_pages = weakref.WeakSet()
+
     @staticmethod
-    def _validate_js_syntax(js_code: str) -> bool:
-        """
-        Validate that generated JavaScript is syntactically correct.
-        """
-        try:
-            # Basic syntax check using a simple JS parser approach
-            # Remove comments and check for balanced braces/brackets
-            import re
-            
-            # Remove single-line comments
-            js_code = re.sub(r'//.*$', '', js_code, flags=re.MULTILINE)
-            # Remove multi-line comments
-            js_code = re.sub(r'/\*.*?\*/', '', js_code, flags=re.DOTALL)
-            
-            # Check for balanced parentheses, braces, and brackets
-            parens = 0
-            braces = 0
-            brackets = 0
-            in_string = False
-            string_char = None
-            
-            for char in js_code:
-                if in_string:
-                    if char == string_char:
-                        in_string = False
-                        string_char = None
-                    continue
-                elif char in ['"', "'"]:
-                    in_string = True
-                    string_char = char
-                    continue
-                
-                if char == '(':
-                    parens += 1
-                elif char == ')':
-                    parens -= 1
-                elif char == '{':
-                    braces += 1
-                elif char == '}':
-                    braces -= 1
-                elif char == '[':
-                    brackets += 1
-                elif char == ']':
-                    brackets -= 1
-                
-                # Early exit if any counter goes negative
-                if parens < 0 or braces < 0 or brackets < 0:
-                    return False
-            
-            # Check if all are balanced
-            return parens == 0 and braces == 0 and brackets == 0
-            
-        except Exception:
-            return False
+    async def install_extractors(page: Page) -> None:
+        """Install the extraction functions on the page and on every later navigation."""
+        if page in PlaywrightExecutor._extractor_pages:
+            return
+        await page.add_init_script(PlaywrightExecutor.EXTRACTORS_INIT_JS)
+        # Init scripts only run on the next navigation; cover the current document too
+        await page.evaluate(PlaywrightExecutor.EXTRACTORS_INIT_JS)
+        PlaywrightExecutor._extractor_pages.add(page)
 
     @staticmethod
     def _get_extraction_function(tech_info: dict) -> str:
@@ -165,60 +137,32 @@ class PlaywrightExecutor:
     @staticmethod
     def _generate_simple_extraction_js(container_sel: str, fields: dict, tech_info: dict) -> str:
         """
-        Generate simplified, validated JavaScript for data extraction.
+        Return the JavaScript call for data extraction.
+        Calls the functions registered by EXTRACTORS_INIT_JS (see install_extractors);
+        the selector and fields are passed separately as {"sel": ..., "fields": ...}.
         """
         # Get the appropriate function name
         function_name = PlaywrightExecutor._get_extraction_function(tech_info)
         
-        # Generate the JS call with proper function wrapper
-        fields_json = json.dumps(fields)
-        js_code = f"""() => {{
-            // Define extraction functions
-            {PlaywrightExecutor.EXTRACTION_FUNCTIONS['spa']}
-            {PlaywrightExecutor.EXTRACTION_FUNCTIONS['static']}
-            {PlaywrightExecutor.EXTRACTION_FUNCTIONS['traditional']}
-            
-            // Execute extraction and return result
-            return {function_name}('{container_sel}', {fields_json});
-                try:
-                    fallback_data = await page.evaluate(f"""
-                    () => {{
-                        const containers = document.querySelectorAll('{container_sel}');
-                        return Array.from(containers).map(container => ({
-                            'fallback_text': container.textContent ? container.textContent.trim() : '',
-                            'error': 'JS extraction failed'
-                        }));
-                    }}
-                    """)
-                    step["extracted_data"] = fallback_data or []
+        # One constant source string per tech type, so the browser can reuse its compiled script
+        return f"(a) => window.__{function_name}(a.sel, a.fields)"
 
-                    # Try to capture a focused element screenshot and short text summary
-                    try:
-                        tmp_dir = Path("scripts") / "tmp_screenshots"
-                        tmp_dir.mkdir(parents=True, exist_ok=True)
-                        stamp = int(time.time())
-                        # Capture first matching element if present
-                        el = await page.query_selector(container_sel)
-                        if el:
-                            shot_path = tmp_dir / f"element_{stamp}.png"
-                            await el.screenshot(path=str(shot_path))
-                            # Capture a short text summary from the element
-                            try:
-                                text = (await page.evaluate("el => el.innerText", el)) or ''
-                            except Exception:
-                                text = ''
-                            step["visual_summary"] = (text.strip().replace('\n', ' ')[:500])
-                            step["screenshot_path"] = str(shot_path)
-                            logger.debug("Saved element screenshot {} and summary (len={})", shot_path, len(step["visual_summary"]))
-                        else:
-                            logger.debug("No element found for selector {} to screenshot", container_sel)
-                    except Exception as _:
-                        logger.debug("Element screenshot failed for selector {}", container_sel)
+    @staticmethod
+    def preprocess_plan(steps: list) -> list:
+        """
+        Resolve fill values once when the plan is loaded.
+        "$NAME" values are read from the environment, anything else is used literally;
+        the result is stored in step["_resolved_value"].
+        """
+        for step in steps:
+            if step.get("action") == "fill":
+                value = step.get("value") or ""
+                step["_resolved_value"] = os.environ.get(value.lstrip("$"), "") if value.startswith("$") else value
+        return steps
 
-                    logger.warning("⚠️ Used fallback extraction, got {} items", len(step['extracted_data']))
-                except Exception as fallback_error:
-                    logger.error("Even fallback extraction failed: {}", fallback_error)
-                    step["extracted_data"] = []
+    @staticmethod
+    async def execute_step(page: Page, step: dict, tech_info: dict = None) -> None:
+        action = step["action"]
         logger.debug("Executor: starting action={} save_as={} selector={}", action, step.get("save_as"), step.get("selector"))
         
         if action == "click":
@@ -226,12 +170,13 @@ class PlaywrightExecutor:
             await page.locator(sel).click()
             
         elif action == "fill":
-            value = os.getenv(step["value"].strip("$"), "") if step.get("value") else ""
+            if "_resolved_value" not in step:
+                PlaywrightExecutor.preprocess_plan([step])
             sel = step.get("selector") or f"text={step['element']}"
-            await page.locator(sel).fill(value)
+            await page.locator(sel).fill(step["_resolved_value"])
             
         elif action == "extract":
-            # Simplified tech-aware extraction with validation
+            # Simplified tech-aware extraction
             # If the plan didn't provide fields, assume container holds the text directly
             if step.get("fields"):
                 fields = step.get("fields")
@@ -243,27 +188,14 @@ class PlaywrightExecutor:
             if tech_info and (tech_info.get("spa") or tech_info.get("react") or tech_info.get("vue") or tech_info.get("angular")):
                 await page.wait_for_timeout(500)  # Wait for SPA to stabilize
             
-            # Generate and validate JS code
+            # Call the pre-installed extraction function for this tech stack
+            await PlaywrightExecutor.install_extractors(page)
             js_code = PlaywrightExecutor._generate_simple_extraction_js(container_sel, fields, tech_info or {})
             
-            # Additional validation before execution
-            if not PlaywrightExecutor._validate_js_syntax(js_code):
-                logger.error("Generated JS failed final validation - using emergency fallback")
-                # Emergency fallback - very simple extraction
-                js_code = f"""
-                () => {{
-                    const containers = document.querySelectorAll('{container_sel}');
-                    return Array.from(containers).map(container => {{
-                        const record = {{}};
-                        {chr(10).join([f"const {field}El = container.querySelector('{selector}'); record['{field}'] = {field}El ? {field}El.textContent.trim() : '';" for field, selector in fields.items()])}
-                        return record;
-                    }});
-                }}
-                """
+            js_args = {"sel": container_sel, "fields": fields}
             
             try:
-                # Execute the validated JS
-                data = await page.evaluate(js_code)
+                data = await page.evaluate(js_code, js_args)
                 step["extracted_data"] = data or []
                 logger.info("Executor: extracted {} items for save_as={}", len(step.get('extracted_data', [])), step.get('save_as'))
                 
@@ -271,19 +203,43 @@ class PlaywrightExecutor:
                 logger.error(f"JS execution failed: {js_error}")
                 # Final fallback - extract just the container text
                 try:
-                    fallback_data = await page.evaluate(f"""
-                    () => {{
-                        const containers = document.querySelectorAll('{container_sel}');
-                        return Array.from(containers).map(container => ({{
+                    fallback_data = await page.evaluate("""
+                    (sel) => {
+                        const containers = document.querySelectorAll(sel);
+                        return Array.from(containers).map(container => ({
                             'fallback_text': container.textContent ? container.textContent.trim() : '',
                             'error': 'JS extraction failed'
-                        }}));
-                    }}
-                    """)
+                        }));
+                    }
+                    """, container_sel)
                     step["extracted_data"] = fallback_data or []
-                    logger.warning(f"⚠️ Used fallback extraction, got {len(step['extracted_data'])} items")
+
+                    # Try to capture a focused element screenshot and short text summary
+                    try:
+                        tmp_dir = Path("scripts") / "tmp_screenshots"
+                        tmp_dir.mkdir(parents=True, exist_ok=True)
+                        stamp = int(time.time())
+                        # Capture first matching element if present
+                        el = await page.query_selector(container_sel)
+                        if el:
+                            shot_path = tmp_dir / f"element_{stamp}.png"
+                            await el.screenshot(path=str(shot_path))
+                            # Capture a short text summary from the element
+                            try:
+                                text = (await page.evaluate("el => el.innerText", el)) or ''
+                            except Exception:
+                                text = ''
+                            step["visual_summary"] = (text.strip().replace('\n', ' ')[:500])
+                            step["screenshot_path"] = str(shot_path)
+                            logger.debug("Saved element screenshot {} and summary (len={})", shot_path, len(step["visual_summary"]))
+                        else:
+                            logger.debug("No element found for selector {} to screenshot", container_sel)
+                    except Exception as _:
+                        logger.debug("Element screenshot failed for selector {}", container_sel)
+
+                    logger.warning("⚠️ Used fallback extraction, got {} items", len(step['extracted_data']))
                 except Exception as fallback_error:
-                    logger.error(f"Even fallback extraction failed: {fallback_error}")
+                    logger.error("Even fallback extraction failed: {}", fallback_error)
                     step["extracted_data"] = []
             
         elif action == "download":
@@ -306,8 +262,9 @@ class PlaywrightExecutor:
         elif action == "paginate":
             # Manual pagination
             logger.info("Manual pagination step – clicking Next until gone")
-            while await page.locator("text=Next").count():
-                await page.locator("text=Next").click()
+            next_btn = page.locator("text=Next")
+            while await next_btn.count():
+                await next_btn.click()
                 await page.wait_for_timeout(1000)
                 
         elif action == "api_extract":
@@ -355,9 +312,10 @@ class PlaywrightExecutor:
                 );
                 """
             
-            return f'''            # Generate validated extraction JS
+            return f'''            # Register extraction functions, then run the extraction JS
+            await page.evaluate("""{PlaywrightExecutor.EXTRACTORS_INIT_JS}""")
             js_code = """{js_code}"""
-            data = await page.evaluate(js_code)
+            data = await page.evaluate(js_code, {{"sel": {container_sel!r}, "fields": {fields!r}}})
             {filter_js}
             await save("json", data, "{step['save_as']}")'''
             
@@ -372,8 +330,10 @@ class PlaywrightExecutor:
             return f'            await page.locator("{sel}").click()'
             
         elif step["action"] == "fill":
+            if "_resolved_value" not in step:
+                PlaywrightExecutor.preprocess_plan([step])
             sel = step.get("selector") or f"text={step['element']}"
-            value = os.getenv(step["value"].strip("$"), "") if step.get("value") else ""
+            value = step["_resolved_value"]
             return f'            await page.locator("{sel}").fill("{value}")'
             
         else:
@@ -431,56 +391,13 @@ class AutoSpider(scrapy.Spider):
 # Run: scrapy runspider auto_spider.py
 '''
 
-class BrowserUseExecutor:
+class AgentBrowserUseExecutor:
+    """Runs a browser-use plan through the vision-assisted browser_use Agent."""
     @staticmethod
     def generate_task(url: str, task: str) -> str:
         return f'Go to {url} and {task}. Use vision if elements are not clear.'
 
     @staticmethod
-    def generate_code(url: str, task: str, steps: list) -> str:
-        return f"""# Browser-use generated script
-import asyncio
-from playwright.async_api import async_playwright
-
-async def main():
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        context = await browser.new_context()
-        page = await context.new_page()
-        await page.goto('{url}', wait_until='domcontentloaded')
-        # Steps: {steps}
-        await browser.close()
-
-if __name__ == '__main__':
-    asyncio.run(main())
-"""
-
-    @staticmethod
-    async def execute_steps(url: str, task: str, steps: list) -> dict:
-        """Execute a list of steps using Playwright; returns extracted data dict."""
-        from playwright.async_api import async_playwright
-
-        result = {}
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            context = await browser.new_context()
-            page = await context.new_page()
-            await page.goto(url, wait_until='domcontentloaded')
-
-            for step in steps:
-                try:
-                    await PlaywrightExecutor.execute_step(page, step, {})
-                except Exception:
-                    # Continue on step failures in browser-use mode
-                    continue
-
-            for s in steps:
-                if s.get('action') == 'extract':
-                    result[s.get('save_as', f"extract_{len(result)}")] = s.get('extracted_data', [])
-
-            await browser.close()
-        return result
-    @staticmethod
     async def execute_steps(url: str, task: str, steps: list) -> dict:
         """
         Executes steps using browser_use Agent for vision-assisted tasks.
@@ -1,5 +1,9 @@
 from playwright.async_api import Page
 import json
+import re
+
+# URL fragments that mark a response as an API call
+_API_RE = re.compile(r"api|graphql|/data|/json")
 
 class APIInterceptor:
     @staticmethod
@@ -11,7 +15,7 @@ class APIInterceptor:
         
         def handle_response(response):
             url = response.url
-            if any(x in url for x in ["api", "graphql", "/data", "/json"]):
+            if _API_RE.search(url):
                 api_calls[url] = {
                     "status": response.status,
                     "headers": dict(response.headers)
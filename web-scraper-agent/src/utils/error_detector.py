@@ -3,6 +3,36 @@ from playwright.async_api import Page
 from loguru import logger
 from typing import List, Dict, Any
 
+# Collects every page-side signal for detect_impending_errors in one evaluate.
+# The body text is read and lowercased once, and a single regex pass over it
+# reports which indicator groups occur (stopping once all of them have been seen)
+_SIGNALS_JS = """
+() => {
+    const text = document.body.textContent.toLowerCase();
+    const needleTags = {
+        'rate limit': 'rate_limit', 'too many requests': 'rate_limit', '429': 'rate_limit',
+        'geographic': 'geo', 'region': 'geo', 'location blocked': 'geo',
+        'maintenance': 'maintenance', 'temporarily unavailable': 'maintenance', 'down for maintenance': 'maintenance'
+    };
+    const tags = new Set();
+    for (const m of text.matchAll(/rate limit|too many requests|429|geographic|region|location blocked|down for maintenance|maintenance|temporarily unavailable/g)) {
+        tags.add(needleTags[m[0]]);
+        if (tags.size === 3) break;
+    }
+    let memory = 0;
+    try {
+        memory = performance.memory?.usedJSHeapSize || 0;
+    } catch (e) {}  // Memory API not available
+    return {
+        cloudflare: !!document.querySelector('#challenge-form, .cf-browser-verification, #cf-challenge-running, .cf-error-details'),
+        bot: !!document.querySelector('[class*="recaptcha"], [id*="recaptcha"], [class*="hcaptcha"], [id*="hcaptcha"]'),
+        memory: memory,
+        tags: Array.from(tags),
+        load_time: performance.timing.loadEventEnd - performance.timing.navigationStart
+    };
+}
+"""
+
 class ProactiveErrorDetector:
     """Proactively detects potential scraping issues before they cause errors."""
 
@@ -17,38 +47,25 @@ class ProactiveErrorDetector:
         tech_info = tech_info or {}
 
         try:
+            # All page-side checks in one round trip
+            signals = await page.evaluate(_SIGNALS_JS)
+            text_tags = set(signals["tags"])
+
             # Check for Cloudflare/anti-bot protection
-            cloudflare_detected = await page.evaluate("""
-                () => {
-                    return !!document.querySelector('#challenge-form, .cf-browser-verification, #cf-challenge-running, .cf-error-details');
-                }
-            """)
-            if cloudflare_detected:
+            if signals["cloudflare"]:
                 warnings.append("cloudflare_protection")
                 logger.warning("🛡️ Cloudflare protection detected")
 
             # Check for other bot detection systems
-            bot_detection = await page.evaluate("""
-                () => {
-                    return !!document.querySelector('[class*="recaptcha"], [id*="recaptcha"], [class*="hcaptcha"], [id*="hcaptcha"]');
-                }
-            """)
-            if bot_detection:
+            if signals["bot"]:
                 warnings.append("captcha_system")
                 logger.warning("🤖 CAPTCHA system detected")
 
-            # Check memory usage (if available)
-            try:
-                memory_usage = await page.evaluate("""
-                    () => {
-                        return performance.memory?.usedJSHeapSize || 0;
-                    }
-                """)
-                if memory_usage > 500000000:  # 500MB
-                    warnings.append("high_memory_usage")
-                    logger.warning(f"🧠 High memory usage detected: {memory_usage / 1024 / 1024:.1f}MB")
-            except:
-                pass  # Memory API not available
+            # Check memory usage (0 if the Memory API is not available)
+            memory_usage = signals["memory"]
+            if memory_usage > 500000000:  # 500MB
+                warnings.append("high_memory_usage")
+                logger.warning(f"🧠 High memory usage detected: {memory_usage / 1024 / 1024:.1f}MB")
 
             # Check for heavy JavaScript
             script_count = tech_info.get("script_count", 0)
@@ -57,44 +74,22 @@ class ProactiveErrorDetector:
                 logger.warning(f"⚡ Heavy JavaScript detected: {script_count} scripts")
 
             # Check for rate limiting indicators
-            rate_limit_indicators = await page.evaluate("""
-                () => {
-                    const text = document.body.textContent.toLowerCase();
-                    return text.includes('rate limit') || text.includes('too many requests') || text.includes('429');
-                }
-            """)
-            if rate_limit_indicators:
+            if "rate_limit" in text_tags:
                 warnings.append("rate_limit_indicators")
                 logger.warning("🐌 Rate limiting indicators detected in page content")
 
             # Check for geographic restrictions
-            geo_indicators = await page.evaluate("""
-                () => {
-                    const text = document.body.textContent.toLowerCase();
-                    return text.includes('geographic') || text.includes('region') || text.includes('location blocked');
-                }
-            """)
-            if geo_indicators:
+            if "geo" in text_tags:
                 warnings.append("geographic_restrictions")
                 logger.warning("🌍 Geographic restrictions detected")
 
             # Check for maintenance pages
-            maintenance_indicators = await page.evaluate("""
-                () => {
-                    const text = document.body.textContent.toLowerCase();
-                    return text.includes('maintenance') || text.includes('temporarily unavailable') || text.includes('down for maintenance');
-                }
-            """)
-            if maintenance_indicators:
+            if "maintenance" in text_tags:
                 warnings.append("maintenance_mode")
                 logger.warning("🔧 Site appears to be in maintenance mode")
 
             # Check for very slow loading (basic heuristic)
-            load_time = await page.evaluate("""
-                () => {
-                    return performance.timing.loadEventEnd - performance.timing.navigationStart;
-                }
-            """)
+            load_time = signals["load_time"]
             if load_time > 30000:  # 30 seconds
                 warnings.append("slow_loading")
                 logger.warning(f"🐌 Very slow page load detected: {load_time/1000:.1f}s")
@@ -2,6 +2,23 @@
 from playwright.async_api import Page
 from loguru import logger
 import random  # Added for human-like delays
+import orjson
+from hashlib import blake2b
+from orjson import OPT_SORT_KEYS
+
+# "Next" button candidates in priority order
+NEXT_SELECTORS = (
+    "a:has-text('Next')",
+    "a:has-text('Next page')",
+    "button:has-text('Next')",
+    "[class*='next']",
+    "[class*='pagination'] a:last-child",
+    "a[rel='next']",
+    "[aria-label*='Next']",
+)
+# All candidates as one selector list: a single query tells whether any exist
+# at all (it matches in DOM order, so it can't pick the button itself)
+NEXT_SELECTOR_ANY = ", ".join(NEXT_SELECTORS)
 
 class Paginator:
     @staticmethod
@@ -9,7 +26,8 @@ class Paginator:
         page: Page, 
         extract_fn, 
         max_pages: int = 10,  # Default: stop after 10 pages (prevent infinite loops)
-        next_text: str = "Next"
+        next_text: str = "Next",
+        human_like: bool = False  # Add random 1-3s pauses between actions
     ) -> list:
         """
         Generic pagination that:
@@ -20,24 +38,32 @@ class Paginator:
         all_data = []
         seen_hashes = set()  # Track unique items by hash
         page_num = 1
+        # Human-like 1-3s delays for the whole run, drawn up front: each page uses
+        # one after scrolling and one after clicking Next (or the scroll fallback)
+        if human_like:
+            delays = iter([random.randrange(1000, 3001) for _ in range(max_pages * 2)])
 
         while page_num <= max_pages:
             logger.info(f"📄 Scraping page {page_num}/{max_pages}")
             
             # Scroll to load lazy content
             await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-            await page.wait_for_timeout(random.randint(1000, 3000))  # Human-like delay: 1-3s
+            if human_like:
+                await page.wait_for_timeout(next(delays))  # Human-like delay: 1-3s
+            else:
+                await page.wait_for_timeout(500)  # Brief wait for lazy content
             
             # Extract data
             new_data = await extract_fn(page)
             
-            # Check for duplicates (deduplicate by text content)
-            unique_new = []
-            for item in new_data:
-                item_hash = hash(str(item))
-                if item_hash not in seen_hashes:
-                    seen_hashes.add(item_hash)
-                    unique_new.append(item)
+            # Check for duplicates (deduplicate by a stable 8-byte content fingerprint;
+            # sorted keys make dicts with reordered keys hash the same). Each item is
+            # fingerprinted once, checked and recorded in the same pass
+            unique_new = [
+                item for item in new_data
+                if (item_hash := blake2b(orjson.dumps(item, option=OPT_SORT_KEYS), digest_size=8).digest()) not in seen_hashes
+                and (seen_hashes.add(item_hash) or True)
+            ]
             
             if not unique_new:
                 logger.info("No new unique data – stopping pagination")
@@ -45,35 +71,29 @@ class Paginator:
                 
             all_data.extend(unique_new)
 
-            # Try "Next" button - more specific selectors
-            next_selectors = [
-                "a:has-text('Next')",
-                "a:has-text('Next page')", 
-                "button:has-text('Next')",
-                "[class*='next']",
-                "[class*='pagination'] a:last-child",
-                "a[rel='next']",
-                "[aria-label*='Next']"
-            ]
-            
+            # Try "Next" button - first visible match in selector priority order,
+            # skipping the per-selector queries when nothing matches at all
             next_btn = None
-            for selector in next_selectors:
-                candidate = page.locator(selector).first
-                if await candidate.count() > 0 and await candidate.is_visible():
-                    next_btn = candidate
-                    break
+            if await page.locator(NEXT_SELECTOR_ANY).count() > 0:
+                for selector in NEXT_SELECTORS:
+                    candidate = page.locator(selector).first
+                    if await candidate.count() > 0 and await candidate.is_visible():
+                        next_btn = candidate
+                        break
             
             if next_btn:
                 await next_btn.click()
                 await page.wait_for_load_state("networkidle")
-                await page.wait_for_timeout(random.randint(1000, 3000))  # Human-like delay after click
+                if human_like:
+                    await page.wait_for_timeout(next(delays))  # Human-like delay after click
                 page_num += 1
                 continue
 
             # Fallback: scroll to bottom (infinite scroll)
             await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
             await page.wait_for_timeout(2000)
-            await page.wait_for_timeout(random.randint(1000, 3000))  # Additional delay
+            if human_like:
+                await page.wait_for_timeout(next(delays))  # Additional delay
             page_num += 1
 
         if page_num > max_pages:
@@ -4,6 +4,40 @@ import hashlib
 from typing import Dict, List, Any, Union
 from loguru import logger
 
+_DIGIT_RE = re.compile(r'\d')
+
+# filter_data dispatches on exact type: strings are filtered, dicts and lists are
+# walked, everything listed as _SCALAR is returned untouched. Unlisted types
+# (subclasses such as OrderedDict) are classified once via _classify
+_SCALAR, _STR, _DICT, _LIST = 0, 1, 2, 3
+_KINDS = {str: _STR, dict: _DICT, list: _LIST, int: _SCALAR, float: _SCALAR, bool: _SCALAR, type(None): _SCALAR}
+
+
+def _classify(value) -> int:
+    """Slow path of the _KINDS lookup for types not listed there."""
+    if isinstance(value, dict):
+        return _DICT
+    if isinstance(value, list):
+        return _LIST
+    if isinstance(value, str):
+        return _STR
+    return _SCALAR
+
+# Field names that indicate sensitive data
+_SENSITIVE_FIELDS = frozenset({
+    'email', 'phone', 'mobile', 'telephone', 'cell',
+    'ssn', 'social_security', 'socialsecurity',
+    'credit_card', 'cc_number', 'card_number',
+    'password', 'passwd', 'pwd',
+    'token', 'api_key', 'apikey', 'auth_token',
+    'session_id', 'sessionid',
+    'ip_address', 'ip',
+    'address', 'home_address', 'billing_address',
+    'name', 'full_name', 'first_name', 'last_name',
+    'dob', 'date_of_birth', 'birth_date',
+    'user_id', 'userid', 'customer_id'
+})
+
 class PrivacyFilter:
     """Filters and redacts personally identifiable information from extracted data."""
 
@@ -40,6 +74,18 @@ class PrivacyFilter:
             re.compile(r'\b[A-Za-z0-9+/=]{20,}\b'),  # Base64-like strings
         ]
 
+        # Redaction passes, applied one after another in this order
+        self._pii_patterns = [
+            ('email', self.email_pattern),
+            ('phone', self.phone_patterns[0]),  # Just use first phone pattern for demo
+            ('ssn', self.ssn_pattern),
+            ('credit_card', self.cc_pattern),
+            ('ip_address', self.ip_pattern),
+        ]
+        # Same patterns as one alternation, used only as a prefilter: it matches
+        # somewhere iff at least one pass would change the string
+        self._combined = re.compile("|".join(f"(?:{pattern.pattern})" for _, pattern in self._pii_patterns))
+
     def filter_data(self, data: Union[Dict, List, str], redact: bool = True) -> Union[Dict, List, str]:
         """
         Filter PII from extracted data.
@@ -51,52 +97,71 @@ class PrivacyFilter:
         Returns:
             Filtered data with PII redacted or flagged
         """
-        if isinstance(data, dict):
-            return self._filter_dict(data, redact)
-        elif isinstance(data, list):
-            return self._filter_list(data, redact)
-        elif isinstance(data, str):
+        kinds = _KINDS
+        kind = kinds.get(type(data))
+        if kind is None:
+            kind = _classify(data)
+        if kind == _STR:
             return self._filter_string(data, redact)
-        else:
+        if kind == _SCALAR:
             return data
 
-    def _filter_dict(self, data: Dict[str, Any], redact: bool) -> Dict[str, Any]:
-        """Filter PII from dictionary data."""
-        filtered = {}
-        for key, value in data.items():
-            # Skip certain fields that commonly contain PII
-            if self._is_sensitive_field(key):
-                if redact:
-                    filtered[key] = self._redact_value(value)
-                    logger.warning(f"🔒 Redacted sensitive field: {key}")
-                else:
-                    filtered[key] = value
-                    logger.warning(f"⚠️ Detected sensitive field: {key}")
+        # Iterative walk over containers only: each stack entry is (container, key, original, kind)
+        # and the filtered copy is written back to container[key], so nesting depth costs
+        # no Python call frames. Strings and scalars are handled in place as they're seen
+        root = [data]
+        stack = [(root, 0, data, kind)]
+        while stack:
+            parent, key, value, kind = stack.pop()
+            if kind == _DICT:
+                filtered = {}
+                for k, v in value.items():
+                    # Skip certain fields that commonly contain PII
+                    if self._is_sensitive_field(k):
+                        if redact:
+                            filtered[k] = self._redact_value(v)
+                            logger.warning("🔒 Redacted sensitive field: {}", k)
+                        else:
+                            filtered[k] = v
+                            logger.warning("⚠️ Detected sensitive field: {}", k)
+                        continue
+                    v_kind = kinds.get(type(v))
+                    if v_kind is None:
+                        v_kind = _classify(v)
+                    if v_kind == _STR:
+                        filtered[k] = self._filter_string(v, redact)
+                    else:
+                        filtered[k] = v  # Containers are replaced when their entry is popped
+                        if v_kind != _SCALAR:
+                            stack.append((filtered, k, v, v_kind))
             else:
-                filtered[key] = self.filter_data(value, redact)
-        return filtered
-
-    def _filter_list(self, data: List[Any], redact: bool) -> List[Any]:
-        """Filter PII from list data."""
-        return [self.filter_data(item, redact) for item in data]
+                filtered = list(value)
+                for i, v in enumerate(value):
+                    v_kind = kinds.get(type(v))
+                    if v_kind is None:
+                        v_kind = _classify(v)
+                    if v_kind == _STR:
+                        filtered[i] = self._filter_string(v, redact)
+                    elif v_kind != _SCALAR:
+                        stack.append((filtered, i, v, v_kind))
+            parent[key] = filtered
+        return root[0]
 
     def _filter_string(self, text: str, redact: bool) -> str:
         """Filter PII from string data."""
         if not isinstance(text, str):
             return text
 
-        original_text = text
+        # Most scraped strings carry no PII: one search answers that without
+        # allocating a new string
+        if not self._combined.search(text):
+            return text
 
-        # Apply all PII patterns
-        pii_patterns = [
-            ('email', self.email_pattern),
-            ('phone', self.phone_patterns[0]),  # Just use first phone pattern for demo
-            ('ssn', self.ssn_pattern),
-            ('credit_card', self.cc_pattern),
-            ('ip_address', self.ip_pattern),
-        ]
+        original_text = text
 
-        for pii_type, pattern in pii_patterns:
+        # Apply all PII patterns in order; overlapping matches must see the
+        # output of the earlier passes, so they can't be fused into one sub()
+        for pii_type, pattern in self._pii_patterns:
             text = self._apply_pattern(text, pattern, pii_type, redact)
 
         if text != original_text and not redact:
@@ -106,41 +171,27 @@ class PrivacyFilter:
 
     def _apply_pattern(self, text: str, pattern: re.Pattern, pii_type: str, redact: bool) -> str:
         """Apply a PII detection/redaction pattern."""
+        if redact:
+            return pattern.sub(f"[REDACTED_{pii_type.upper()}]", text)
+
         def replace_func(match):
-            if redact:
-                return f"[REDACTED_{pii_type.upper()}]"
-            else:
-                logger.warning(f"⚠️ Detected {pii_type}: {match.group()}")
-                return match.group()
+            logger.warning("⚠️ Detected {}: {}", pii_type, match.group())
+            return match.group()
 
         return pattern.sub(replace_func, text)
 
     def _is_sensitive_field(self, field_name: str) -> bool:
         """Check if a field name indicates sensitive data."""
-        sensitive_fields = {
-            'email', 'phone', 'mobile', 'telephone', 'cell',
-            'ssn', 'social_security', 'socialsecurity',
-            'credit_card', 'cc_number', 'card_number',
-            'password', 'passwd', 'pwd',
-            'token', 'api_key', 'apikey', 'auth_token',
-            'session_id', 'sessionid',
-            'ip_address', 'ip',
-            'address', 'home_address', 'billing_address',
-            'name', 'full_name', 'first_name', 'last_name',
-            'dob', 'date_of_birth', 'birth_date',
-            'user_id', 'userid', 'customer_id'
-        }
-
         field_lower = field_name.lower().replace('_', '').replace('-', '')
-        return field_lower in sensitive_fields
+        return field_lower in _SENSITIVE_FIELDS
 
     def _redact_value(self, value: Any) -> str:
         """Redact a sensitive value."""
         if isinstance(value, str):
             # Create a hash-based redaction that's consistent for the same value
             # but doesn't reveal the actual content
-            hash_obj = hashlib.sha256(str(value).encode())
-            hash_short = hash_obj.hexdigest()[:8]
+            # (a 4-byte blake2b digest is exactly the 8 hex chars we keep)
+            hash_short = hashlib.blake2b(value.encode(), digest_size=4).hexdigest()
             return f"[REDACTED_{hash_short}]"
         else:
             return "[REDACTED]"
@@ -152,29 +203,32 @@ class PrivacyFilter:
         Returns:
             List of PII types detected
         """
-        pii_types = []
+        pii_types = set()
 
         def scan_recursive(obj):
             if isinstance(obj, dict):
                 for key, value in obj.items():
                     if self._is_sensitive_field(key):
-                        pii_types.append(f"sensitive_field_{key}")
+                        pii_types.add(f"sensitive_field_{key}")
                     scan_recursive(value)
             elif isinstance(obj, list):
                 for item in obj:
                     scan_recursive(item)
             elif isinstance(obj, str):
-                # Quick scan for patterns
-                if self.email_pattern.search(obj):
-                    pii_types.append("email")
+                # Quick scan for patterns; every pattern below needs an '@' or a digit,
+                # so most plain text is ruled out by one cheap check each
+                if '@' in obj and self.email_pattern.search(obj):
+                    pii_types.add("email")
+                if not _DIGIT_RE.search(obj):
+                    return
                 for pattern in self.phone_patterns:
                     if pattern.search(obj):
-                        pii_types.append("phone")
+                        pii_types.add("phone")
                         break
                 if self.ssn_pattern.search(obj):
-                    pii_types.append("ssn")
+                    pii_types.add("ssn")
                 if self.cc_pattern.search(obj):
-                    pii_types.append("credit_card")
+                    pii_types.add("credit_card")
 
         scan_recursive(data)
-        return list(set(pii_types))  # Remove duplicates
\ No newline at end of file
+        return list(pii_types)
@@ -1,31 +1,67 @@
 # src/utils/rate_limiter.py
 import asyncio
 import time
-from collections import defaultdict
-from urllib.parse import urlparse
+from collections import defaultdict, deque
+from functools import lru_cache
 from loguru import logger
 
+_SCHEME_CHARS = frozenset("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789+-.")
+
+@lru_cache(maxsize=4096)
+def _extract_domain(url: str) -> str:
+    """Extract domain (host[:port], lowercased, without credentials) from URL."""
+    # Only the netloc matters, so slice it out directly instead of a full urlparse
+    start = url.find("://")
+    if start > 0 and _SCHEME_CHARS.issuperset(url[:start]):
+        start += 3
+    elif url.startswith("//"):
+        start = 2
+    else:
+        return ""
+    end = len(url)
+    for sep in "/?#":
+        pos = url.find(sep, start, end)
+        if pos != -1:
+            end = pos
+    # Drop "user:pass@" so credentials never end up as dict keys or in logs
+    at = url.rfind("@", start, end)
+    if at != -1:
+        start = at + 1
+    return url[start:end].lower()
+
+def _domain_key(domain: str) -> str:
+    """Normalize a caller-supplied domain (netloc or URL) to the _extract_domain form."""
+    if "://" in domain or domain.startswith("//"):
+        return _extract_domain(domain)
+    return domain[domain.rfind("@") + 1:].lower()
+
 class RateLimiter:
     """Domain-aware rate limiter with polite crawling delays."""
 
     def __init__(self):
-        # Domain -> list of request timestamps
-        self.request_history = defaultdict(list)
+        # Domain -> last 100 request timestamps
+        self.request_history = defaultdict(lambda: deque(maxlen=100))
         # Domain -> current delay between requests
         self.domain_delays = defaultdict(float)
-        # Domain -> last request time
-        self.last_request_time = defaultdict(float)
+        # Domain -> monotonic start time of the last request. The next one may start at
+        # _last_start + domain_delays, so a delay raised after a 429 applies right away
+        self._last_start = defaultdict(lambda: float("-inf"))
+        # Domain -> lock serializing the read-sleep-write of _last_start
+        self._locks = defaultdict(asyncio.Lock)
         # Global rate limiting
-        self.global_last_request = 0.0
+        self._global_next_ready = float("-inf")
+        self._global_lock = asyncio.Lock()
         self.global_min_delay = 1.0  # Minimum 1 second between any requests
 
     def set_domain_delay(self, domain: str, delay_seconds: float):
         """Set the minimum delay between requests for a specific domain."""
+        domain = _domain_key(domain)
         self.domain_delays[domain] = max(delay_seconds, 0.1)  # Minimum 100ms
         logger.info(f"⏱️ Set domain delay for {domain}: {delay_seconds}s")
 
     def update_from_retry_after(self, domain: str, retry_after_seconds: float):
         """Update domain delay based on Retry-After header."""
+        domain = _domain_key(domain)
         current_delay = self.domain_delays[domain]
         # Use the larger of current delay or retry-after, with some buffer
         new_delay = max(current_delay, retry_after_seconds * 1.2)
@@ -34,57 +70,48 @@ class RateLimiter:
 
     async def wait_if_needed(self, url: str):
         """Wait if necessary to respect rate limits for the given URL."""
-        domain = self._extract_domain(url)
-        now = time.time()
-
-        # Global rate limiting
-        global_wait = max(0, self.global_min_delay - (now - self.global_last_request))
-        if global_wait > 0:
-            logger.debug(f"🌐 Global rate limit: waiting {global_wait:.2f}s")
-            await asyncio.sleep(global_wait)
+        domain = _extract_domain(url)
+
+        # Global rate limiting. The lock brackets read-sleep-write so concurrent
+        # callers queue up behind each other instead of computing the same wait
+        async with self._global_lock:
+            now = time.monotonic()
+            global_wait = self._global_next_ready - now
+            if global_wait > 0:
+                logger.debug(f"🌐 Global rate limit: waiting {global_wait:.2f}s")
+                await asyncio.sleep(global_wait)
+            self._global_next_ready = max(now, self._global_next_ready) + self.global_min_delay
 
         # Domain-specific rate limiting
-        domain_delay = self.domain_delays[domain]
-        last_domain_request = self.last_request_time[domain]
-
-        if domain_delay > 0:
-            domain_wait = max(0, domain_delay - (now - last_domain_request))
+        async with self._locks[domain]:
+            now = time.monotonic()
+            domain_wait = self._last_start[domain] + self.domain_delays[domain] - now
             if domain_wait > 0:
                 logger.debug(f"🏢 Domain rate limit for {domain}: waiting {domain_wait:.2f}s")
                 await asyncio.sleep(domain_wait)
+                now += domain_wait
+            self._last_start[domain] = now
 
-        # Update timestamps
-        self.last_request_time[domain] = time.time()
-        self.global_last_request = time.time()
-
-        # Track request history (keep last 100 requests per domain)
+        # Track request history (the deque keeps the last 100 requests per domain)
         self.request_history[domain].append(now)
-        if len(self.request_history[domain]) > 100:
-            self.request_history[domain].pop(0)
 
     def get_domain_stats(self, domain: str) -> dict:
         """Get rate limiting statistics for a domain."""
-        history = self.request_history[domain]
+        domain = _domain_key(domain)
+        # .get() so asking about an unseen domain doesn't create entries for it
+        history = self.request_history.get(domain)
         if not history:
-            return {"requests_last_minute": 0, "current_delay": self.domain_delays[domain]}
+            return {"requests_last_minute": 0, "current_delay": self.domain_delays.get(domain, 0.0)}
 
-        now = time.time()
-        recent_requests = [t for t in history if now - t < 60]  # Last minute
+        now = time.monotonic()
+        recent_requests = sum(1 for t in history if now - t < 60)  # Last minute
 
         return {
-            "requests_last_minute": len(recent_requests),
-            "current_delay": self.domain_delays[domain],
+            "requests_last_minute": recent_requests,
+            "current_delay": self.domain_delays.get(domain, 0.0),
             "total_requests": len(history)
         }
 
-    def _extract_domain(self, url: str) -> str:
-        """Extract domain from URL."""
-        try:
-            parsed = urlparse(url)
-            return parsed.netloc.lower()
-        except:
-            return "unknown"
-
     def set_polite_delay(self, domain: str, requests_per_minute: int = 30):
         """Set a polite delay based on desired requests per minute."""
         if requests_per_minute <= 0:
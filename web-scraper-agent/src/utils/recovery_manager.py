@@ -1,8 +1,18 @@
 # src/utils/recovery_manager.py
-import copy
 from typing import Dict, Any
 from loguru import logger
 
+
+def _json_clone(value):
+    """Deep-copy JSON-shaped data (dicts, lists, scalars) without copy.deepcopy's memo."""
+    t = type(value)
+    if t is dict:
+        return {k: _json_clone(v) for k, v in value.items()}
+    if t is list:
+        return [_json_clone(v) for v in value]
+    return value  # str/int/float/bool/None are immutable
+
+
 class RecoveryManager:
     """Provides fallback recovery strategies when steps fail."""
 
@@ -20,32 +30,8 @@ class RecoveryManager:
             Modified step with fallback strategy
         """
         context = context or {}
-        fallback_step = copy.deepcopy(original_step)
-
-        strategy_map = {
-            "selector_not_found": RecoveryManager._broaden_selectors,
-            "timeout": RecoveryManager._add_timeouts,
-            "bot_detection": RecoveryManager._switch_to_api_mode,
-            "javascript_error": RecoveryManager._simplify_javascript,
-            "page_load_error": RecoveryManager._add_wait_conditions,
-            "network_error": RecoveryManager._add_retry_logic,
-            "rate_limit": RecoveryManager._handle_rate_limit,
-            "dns_error": RecoveryManager._handle_dns_error,
-            "ssl_error": RecoveryManager._handle_ssl_error,
-            "connection_error": RecoveryManager._handle_connection_error,
-            "server_error": RecoveryManager._handle_server_error,
-            "memory_error": RecoveryManager._handle_memory_error,
-            "encoding_error": RecoveryManager._handle_encoding_error,
-            "json_parse_error": RecoveryManager._handle_json_error,
-            "stale_element": RecoveryManager._handle_stale_element,
-            "frame_error": RecoveryManager._handle_frame_error,
-            "dialog_error": RecoveryManager._handle_dialog_error,
-            "ajax_error": RecoveryManager._handle_ajax_error,
-            "cpu_timeout": RecoveryManager._handle_cpu_timeout,
-        }
-
-        strategy_func = strategy_map.get(error_type, RecoveryManager._default_fallback)
-        return strategy_func(fallback_step, context)
+        fallback_step = _json_clone(original_step)
+        return _STRATEGY_MAP.get(error_type, _DEFAULT_STRATEGY)(fallback_step, context)
 
     @staticmethod
     def _broaden_selectors(step: Dict[str, Any], context: Dict[str, Any]) -> Dict[str, Any]:
@@ -62,12 +48,12 @@ class RecoveryManager:
                 f"[aria-label*='{step.get('element', '')}']",    # Try aria labels
             ]
 
-            # Remove empty selectors and duplicates
-            broader_selectors = list(set(sel for sel in broader_selectors if sel))
+            # Remove empty selectors and duplicates, keeping priority order
+            broader_selectors = list(dict.fromkeys(sel for sel in broader_selectors if sel))
 
             if len(broader_selectors) > 1:
                 step["fallback_selectors"] = broader_selectors[1:]
-                logger.info(f"🔄 Broadened selectors for {step.get('comment', 'step')}: {broader_selectors}")
+                logger.info("🔄 Broadened selectors for {}: {}", step.get("comment", "step"), broader_selectors)
 
         return step
 
@@ -86,7 +72,7 @@ class RecoveryManager:
         elif step.get("action") == "extract":
             step["wait_for"] = "domcontentloaded"
 
-        logger.info(f"⏱️  Added timeout handling for {step.get('comment', 'step')}: {step.get('timeout')}ms")
+        logger.info("⏱️  Added timeout handling for {}: {}ms", step.get("comment", "step"), step.get("timeout"))
         return step
 
     @staticmethod
@@ -97,12 +83,12 @@ class RecoveryManager:
             step["action"] = "api_extract"
             step["api_endpoint"] = context["api_endpoints"][0]  # Use first available endpoint
             step["comment"] = f"{step.get('comment', 'Extract')} (API fallback)"
-            logger.info(f"🔌 Switched to API mode for {step.get('comment', 'step')}")
+            logger.info("🔌 Switched to API mode for {}", step.get("comment", "step"))
         else:
             # Add longer delays and stealth mode
             step["stealth_mode"] = True
             step["delay"] = 5000  # 5 second delay
-            logger.info(f"🕵️  Enabled stealth mode for {step.get('comment', 'step')}")
+            logger.info("🕵️  Enabled stealth mode for {}", step.get("comment", "step"))
 
         return step
 
@@ -123,7 +109,7 @@ class RecoveryManager:
 
             step["fields"] = simplified_fields
             step["simplified"] = True
-            logger.info(f"🔧 Simplified JavaScript extraction for {step.get('comment', 'step')}")
+            logger.info("🔧 Simplified JavaScript extraction for {}", step.get("comment", "step"))
 
         return step
 
@@ -136,7 +122,7 @@ class RecoveryManager:
         if context.get("spa"):
             step["wait_for_selector"] = "body[data-loaded], main, .content"
 
-        logger.info(f"⏳ Added wait conditions for {step.get('comment', 'step')}")
+        logger.info("⏳ Added wait conditions for {}", step.get("comment", "step"))
         return step
 
     @staticmethod
@@ -144,7 +130,7 @@ class RecoveryManager:
         """Add retry logic for network errors."""
         step["retry_count"] = 3
         step["retry_delay"] = 2000  # 2 seconds
-        logger.info(f"🔄 Added retry logic for {step.get('comment', 'step')}")
+        logger.info("🔄 Added retry logic for {}", step.get("comment", "step"))
         return step
 
     @staticmethod
@@ -154,7 +140,7 @@ class RecoveryManager:
         step["delay"] = min(300, 30 * (2 ** (context.get("retry_count", 0))))  # Max 5 minutes
         step["use_proxy"] = True  # Suggest using different IP
         step["user_agent_rotation"] = True
-        logger.info(f"🐌 Rate limited - adding {step['delay']}s delay and proxy rotation")
+        logger.info("🐌 Rate limited - adding {}s delay and proxy rotation", step["delay"])
         return step
 
     @staticmethod
@@ -266,42 +252,59 @@ class RecoveryManager:
         step["fallback_attempted"] = True
         step["retry_count"] = min(step.get("retry_count", 0) + 1, 3)  # Max 3 retries
         step["retry_delay"] = 2000  # 2 second delay
-        logger.info(f"🔄 Default fallback for {step.get('comment', 'step')} - adding basic retry logic")
+        logger.info("🔄 Default fallback for {} - adding basic retry logic", step.get("comment", "step"))
         return step
 
     @staticmethod
     def should_attempt_recovery(error_type: str, attempt_count: int) -> bool:
         """Determine if recovery should be attempted."""
-        # Never attempt recovery for these critical errors
-        no_recovery_types = [
-            "memory_error",      # System-level issue
-            "disk_space_error",  # System-level issue
-            "ip_blocked",        # Requires IP change
-            "geo_blocked",       # Requires location change
-            "forbidden",         # Access denied permanently
-            "not_found",         # Resource doesn't exist
-        ]
-
-        # Limited recovery attempts for these
-        limited_recovery_types = [
-            "bot_detection",     # Only try API fallback once
-            "captcha_detected",  # Only try once
-            "dns_error",         # DNS issues might resolve quickly
-            "ssl_error",         # SSL issues usually permanent
-        ]
-
-        if error_type in no_recovery_types:
-            return False
-
-        if error_type in limited_recovery_types and attempt_count > 1:
-            return False
-
-        # For server errors, don't attempt recovery after 3 failures
-        if error_type == "server_error" and attempt_count > 3:
-            return False
-
-        # For rate limiting, don't attempt recovery after 5 failures
-        if error_type == "rate_limit" and attempt_count > 5:
-            return False
-
-        return True
\ No newline at end of file
+        limit = _RECOVERY_LIMITS.get(error_type)
+        if limit is None:
+            return True
+        return limit > 0 and attempt_count <= limit
+
+
+# Max recovery attempts per error type (0 = never); unlisted types are unlimited
+_RECOVERY_LIMITS = {
+    # Never attempt recovery for these critical errors
+    "memory_error": 0,       # System-level issue
+    "disk_space_error": 0,   # System-level issue
+    "ip_blocked": 0,         # Requires IP change
+    "geo_blocked": 0,        # Requires location change
+    "forbidden": 0,          # Access denied permanently
+    "not_found": 0,          # Resource doesn't exist
+
+    # Limited recovery attempts for these
+    "bot_detection": 1,      # Only try API fallback once
+    "captcha_detected": 1,   # Only try once
+    "dns_error": 1,          # DNS issues might resolve quickly
+    "ssl_error": 1,          # SSL issues usually permanent
+    "server_error": 3,       # Don't attempt recovery after 3 failures
+    "rate_limit": 5,         # Don't attempt recovery after 5 failures
+}
+
+
+# Error type -> recovery strategy. Looking staticmethods up on the class yields the
+# plain functions, so dispatch is one dict lookup and a direct call.
+_DEFAULT_STRATEGY = RecoveryManager._default_fallback
+_STRATEGY_MAP = {
+    "selector_not_found": RecoveryManager._broaden_selectors,
+    "timeout": RecoveryManager._add_timeouts,
+    "bot_detection": RecoveryManager._switch_to_api_mode,
+    "javascript_error": RecoveryManager._simplify_javascript,
+    "page_load_error": RecoveryManager._add_wait_conditions,
+    "network_error": RecoveryManager._add_retry_logic,
+    "rate_limit": RecoveryManager._handle_rate_limit,
+    "dns_error": RecoveryManager._handle_dns_error,
+    "ssl_error": RecoveryManager._handle_ssl_error,
+    "connection_error": RecoveryManager._handle_connection_error,
+    "server_error": RecoveryManager._handle_server_error,
+    "memory_error": RecoveryManager._handle_memory_error,
+    "encoding_error": RecoveryManager._handle_encoding_error,
+    "json_parse_error": RecoveryManager._handle_json_error,
+    "stale_element": RecoveryManager._handle_stale_element,
+    "frame_error": RecoveryManager._handle_frame_error,
+    "dialog_error": RecoveryManager._handle_dialog_error,
+    "ajax_error": RecoveryManager._handle_ajax_error,
+    "cpu_timeout": RecoveryManager._handle_cpu_timeout,
+}
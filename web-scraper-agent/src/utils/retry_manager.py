@@ -6,12 +6,71 @@ from typing import Callable, Any, Optional
 from loguru import logger
 from .error_classifier import ErrorClassifier
 
+# Base delays by error type (in seconds)
+_BASE_DELAYS = {
+    # Network & Connection (quick retries)
+    "dns_error": 2.0,
+    "ssl_error": 3.0,
+    "connection_error": 1.0,
+    "network_unreachable": 5.0,
+
+    # HTTP Status Codes
+    "rate_limit": 60.0,      # Start with 1 minute for rate limits
+    "server_error": 10.0,    # 10 seconds for 5xx errors
+    "forbidden": 30.0,       # 30 seconds for 403
+    "not_found": 0.0,        # No delay for 404
+
+    # Browser/Automation
+    "timeout": 5.0,
+    "selector_not_found": 1.0,
+    "stale_element": 0.5,
+    "frame_error": 1.0,
+    "dialog_error": 2.0,
+
+    # Anti-Scraping
+    "bot_detection": 120.0,   # 2 minutes for bot detection
+    "captcha_detected": 300.0, # 5 minutes for CAPTCHA
+    "ip_blocked": 600.0,      # 10 minutes for IP blocks
+
+    # Content/Data
+    "javascript_error": 2.0,
+    "json_parse_error": 1.0,
+    "encoding_error": 1.0,
+    "ajax_error": 3.0,
+
+    # System/Resource
+    "memory_error": 10.0,
+    "cpu_timeout": 5.0,
+    "disk_space_error": 0.0,  # No delay, system issue
+
+    # Other
+    "page_load_error": 4.0,
+    "data_extraction_error": 1.0,
+    "websocket_error": 2.0,
+    "race_condition": 1.0,
+    "geo_blocked": 0.0,      # No delay, location issue
+    "storage_error": 1.0,
+
+    # Default
+    "unknown": 2.0
+}
+
+# Cap maximum delay at different levels based on error type
+_MAX_DELAYS = {
+    "rate_limit": 1800.0,      # Max 30 minutes for rate limits
+    "bot_detection": 3600.0,   # Max 1 hour for bot detection
+    "ip_blocked": 7200.0,      # Max 2 hours for IP blocks
+    "default": 300.0           # Max 5 minutes for others
+}
+
+
 class RetryManager:
     """Manages adaptive retry strategies based on error types."""
 
     def __init__(self):
         self.failure_counts = {}
         self.last_retry_times = {}
+        self._rng = random.Random()  # Private jitter RNG, independent of the shared module instance
 
     async def execute_with_retry(
         self,
@@ -40,15 +99,15 @@ class RetryManager:
 
         for attempt in range(max_retries + 1):  # +1 for initial attempt
             try:
-                start_time = time.time()
+                start_time = time.perf_counter()
                 result = await step_func()
-                execution_time = time.time() - start_time
+                execution_time = time.perf_counter() - start_time
 
                 # Success - reset failure count
                 if step_name in self.failure_counts:
                     self.failure_counts[step_name] = 0
 
-                logger.debug(f"✅ {step_name} succeeded (attempt {attempt + 1}, {execution_time:.2f}s)")
+                logger.debug("✅ {} succeeded (attempt {}, {:.2f}s)", step_name, attempt + 1, execution_time)
                 return result
 
             except Exception as e:
@@ -57,22 +116,22 @@ class RetryManager:
 
                 # Update failure tracking
                 self.failure_counts[step_name] = self.failure_counts.get(step_name, 0) + 1
-                self.last_retry_times[step_name] = time.time()
+                self.last_retry_times[step_name] = time.monotonic()  # Only compared, never shown as wall clock
 
                 if attempt == max_retries:
                     # Final attempt failed
-                    logger.error(f"❌ {step_name} failed permanently after {max_retries + 1} attempts: {error_type} - {str(e)}")
+                    logger.error("❌ {} failed permanently after {} attempts: {} - {}", step_name, max_retries + 1, error_type, e)
                     raise
 
                 # Check if we should retry this error type
                 if not ErrorClassifier.should_retry(error_type):
-                    logger.warning(f"🚫 Not retrying {step_name} due to {error_type}: {str(e)}")
+                    logger.warning("🚫 Not retrying {} due to {}: {}", step_name, error_type, e)
                     raise
 
                 # Calculate delay with jitter
                 retry_after = context.get("retry_after") if context else None
                 delay = self._calculate_delay(error_type, attempt, context, retry_after)
-                logger.warning(f"⚠️  {step_name} failed (attempt {attempt + 1}/{max_retries + 1}): {error_type} - retrying in {delay:.1f}s")
+                logger.warning("⚠️  {} failed (attempt {}/{}): {} - retrying in {:.1f}s", step_name, attempt + 1, max_retries + 1, error_type, delay)
 
                 await asyncio.sleep(delay)
 
@@ -83,56 +142,7 @@ class RetryManager:
         if retry_after is not None and error_type == "rate_limit":
             return retry_after * 1.2  # Add 20% buffer
 
-        # Base delays by error type (in seconds)
-        base_delays = {
-            # Network & Connection (quick retries)
-            "dns_error": 2.0,
-            "ssl_error": 3.0,
-            "connection_error": 1.0,
-            "network_unreachable": 5.0,
-
-            # HTTP Status Codes
-            "rate_limit": 60.0,      # Start with 1 minute for rate limits
-            "server_error": 10.0,    # 10 seconds for 5xx errors
-            "forbidden": 30.0,       # 30 seconds for 403
-            "not_found": 0.0,        # No delay for 404
-
-            # Browser/Automation
-            "timeout": 5.0,
-            "selector_not_found": 1.0,
-            "stale_element": 0.5,
-            "frame_error": 1.0,
-            "dialog_error": 2.0,
-
-            # Anti-Scraping
-            "bot_detection": 120.0,   # 2 minutes for bot detection
-            "captcha_detected": 300.0, # 5 minutes for CAPTCHA
-            "ip_blocked": 600.0,      # 10 minutes for IP blocks
-
-            # Content/Data
-            "javascript_error": 2.0,
-            "json_parse_error": 1.0,
-            "encoding_error": 1.0,
-            "ajax_error": 3.0,
-
-            # System/Resource
-            "memory_error": 10.0,
-            "cpu_timeout": 5.0,
-            "disk_space_error": 0.0,  # No delay, system issue
-
-            # Other
-            "page_load_error": 4.0,
-            "data_extraction_error": 1.0,
-            "websocket_error": 2.0,
-            "race_condition": 1.0,
-            "geo_blocked": 0.0,      # No delay, location issue
-            "storage_error": 1.0,
-
-            # Default
-            "unknown": 2.0
-        }
-
-        base_delay = base_delays.get(error_type, 2.0)
+        base_delay = _BASE_DELAYS.get(error_type, 2.0)
 
         # For rate limiting, use exponential backoff with higher base
         if error_type == "rate_limit":
@@ -142,18 +152,10 @@ class RetryManager:
             exponential_delay = base_delay * (1.5 ** attempt)
 
         # Add jitter to prevent thundering herd
-        jitter = random.uniform(0.8, 1.2)
+        jitter = 0.8 + self._rng.random() * 0.4
         delay = exponential_delay * jitter
 
-        # Cap maximum delay at different levels based on error type
-        max_delays = {
-            "rate_limit": 1800.0,      # Max 30 minutes for rate limits
-            "bot_detection": 3600.0,   # Max 1 hour for bot detection
-            "ip_blocked": 7200.0,      # Max 2 hours for IP blocks
-            "default": 300.0           # Max 5 minutes for others
-        }
-
-        max_delay = max_delays.get(error_type, max_delays["default"])
+        max_delay = _MAX_DELAYS.get(error_type, _MAX_DELAYS["default"])
         return min(delay, max_delay)
 
     def get_failure_stats(self, step_name: str = None) -> dict:
@@ -1,13 +1,74 @@
 # src/utils/secure_session.py
-import json
 import base64
 import hashlib
 import os
+from functools import lru_cache
 from pathlib import Path
 from cryptography.fernet import Fernet
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 from loguru import logger
+import ahocorasick
+import orjson
+
+
+def _build_automaton(words) -> "ahocorasick.Automaton":
+    automaton = ahocorasick.Automaton()
+    for word in words:
+        automaton.add_word(word, word)
+    automaton.make_automaton()
+    return automaton
+
+
+# Substrings that mark a cookie / storage entry name as sensitive, each matched
+# in a single pass over the name
+_SENSITIVE_COOKIE_AC = _build_automaton({
+    'session', 'sessionid', 'auth', 'token', 'jwt', 'bearer',
+    'login', 'password', 'passwd', 'credential', 'secret',
+    'api_key', 'apikey', 'access_token', 'refresh_token'
+})
+
+_SENSITIVE_STORAGE_AC = _build_automaton({
+    'token', 'auth', 'session', 'password', 'secret', 'key',
+    'credential', 'login', 'user', 'email', 'phone'
+})
+
+# Cookie attributes stripped from every stored cookie
+_COOKIE_DROP_ATTRS = frozenset({'httpOnly', 'secure', 'sameSite'})
+
+# SESSION_ENCRYPTION_KEY prefix marking a ready-made Fernet key. Without it the
+# value is always a passphrase, so existing deployments keep their derived key
+_RAW_KEY_PREFIX = "fernet:"
+
+@lru_cache(maxsize=8)
+def _derive_key(key_seed: str) -> bytes:
+    """
+    Turn SESSION_ENCRYPTION_KEY into a Fernet key. "fernet:<key>"
+    (Fernet.generate_key() output) is used as-is; anything else is treated
+    as a passphrase and stretched with PBKDF2, once per process. Raises
+    ValueError for a malformed raw key rather than storing sessions unencrypted.
+    """
+    if key_seed.startswith(_RAW_KEY_PREFIX):
+        key = key_seed[len(_RAW_KEY_PREFIX):].encode()
+        try:
+            valid = len(base64.urlsafe_b64decode(key)) == 32
+        except ValueError:
+            valid = False
+        if not valid:
+            raise ValueError(
+                f"SESSION_ENCRYPTION_KEY: '{_RAW_KEY_PREFIX}' must be followed by a Fernet key "
+                "(32 url-safe base64-encoded bytes)"
+            )
+        return key
+
+    salt = b'session_salt_2024'  # Consistent salt
+    kdf = PBKDF2HMAC(
+        algorithm=hashes.SHA256(),
+        length=32,
+        salt=salt,
+        iterations=100000,
+    )
+    return base64.urlsafe_b64encode(kdf.derive(key_seed.encode()))
 
 class SecureSessionStorage:
     """Secure storage for browser sessions with encryption and credential filtering."""
@@ -16,38 +77,34 @@ class SecureSessionStorage:
         self.sessions_dir = sessions_dir or Path("sessions")
         self.sessions_dir.mkdir(exist_ok=True)
         self._key = None
+        self._fernet = None  # Built together with the key, reused for every save/load
 
     def _get_encryption_key(self) -> bytes:
         """Get or generate encryption key."""
         if self._key is None:
             # Use a consistent key derived from environment or generate one
             key_seed = os.getenv("SESSION_ENCRYPTION_KEY", "default_session_key")
-            salt = b'session_salt_2024'  # Consistent salt
-
-            kdf = PBKDF2HMAC(
-                algorithm=hashes.SHA256(),
-                length=32,
-                salt=salt,
-                iterations=100000,
-            )
-            self._key = base64.urlsafe_b64encode(kdf.derive(key_seed.encode()))
+            key = _derive_key(key_seed)
+            self._fernet = Fernet(key)
+            self._key = key
 
         return self._key
 
-    def _encrypt_data(self, data: str) -> str:
-        """Encrypt session data."""
-        try:
-            f = Fernet(self._get_encryption_key())
-            return f.encrypt(data.encode()).decode()
-        except Exception as e:
-            logger.error(f"Failed to encrypt session data: {e}")
-            return data  # Fallback to unencrypted
+    def _get_fernet(self) -> Fernet:
+        """Get the cached Fernet instance for the encryption key."""
+        if self._fernet is None:
+            self._get_encryption_key()
+        return self._fernet
+
+    def _encrypt_data(self, data: bytes) -> str:
+        """Encrypt session data (UTF-8 JSON bytes). Raises if no usable key is configured."""
+        return self._get_fernet().encrypt(data).decode()
 
     def _decrypt_data(self, encrypted_data: str) -> str:
-        """Decrypt session data."""
+        """Decrypt session data. Raises if no usable key is configured."""
+        fernet = self._get_fernet()
         try:
-            f = Fernet(self._get_encryption_key())
-            return f.decrypt(encrypted_data.encode()).decode()
+            return fernet.decrypt(encrypted_data.encode()).decode()
         except Exception as e:
             logger.error(f"Failed to decrypt session data: {e}")
             return encrypted_data  # Fallback to encrypted data
@@ -95,25 +152,17 @@ class SecureSessionStorage:
         if not isinstance(cookies, list):
             return cookies
 
-        sensitive_cookie_names = {
-            'session', 'sessionid', 'auth', 'token', 'jwt', 'bearer',
-            'login', 'password', 'passwd', 'credential', 'secret',
-            'api_key', 'apikey', 'access_token', 'refresh_token'
-        }
-
         filtered_cookies = []
         for cookie in cookies:
             if isinstance(cookie, dict):
                 cookie_name = cookie.get('name', '').lower()
                 # Skip sensitive cookies
-                if any(sensitive in cookie_name for sensitive in sensitive_cookie_names):
-                    logger.warning(f"🔒 Filtered sensitive cookie: {cookie_name}")
+                if next(_SENSITIVE_COOKIE_AC.iter(cookie_name), None) is not None:
+                    logger.warning("🔒 Filtered sensitive cookie: {}", cookie_name)
                     continue
 
                 # Remove sensitive cookie attributes
-                safe_cookie = {k: v for k, v in cookie.items()
-                             if k not in ['httpOnly', 'secure', 'sameSite']}
-                filtered_cookies.append(safe_cookie)
+                filtered_cookies.append({k: v for k, v in cookie.items() if k not in _COOKIE_DROP_ATTRS})
             else:
                 filtered_cookies.append(cookie)
 
@@ -124,18 +173,13 @@ class SecureSessionStorage:
         if not isinstance(storage_data, list):
             return storage_data
 
-        sensitive_keys = {
-            'token', 'auth', 'session', 'password', 'secret', 'key',
-            'credential', 'login', 'user', 'email', 'phone'
-        }
-
         filtered_storage = []
         for item in storage_data:
             if isinstance(item, dict):
                 key = item.get('name', '').lower()
                 # Skip sensitive storage keys
-                if any(sensitive in key for sensitive in sensitive_keys):
-                    logger.warning(f"🔒 Filtered sensitive storage key: {key}")
+                if next(_SENSITIVE_STORAGE_AC.iter(key), None) is not None:
+                    logger.warning("🔒 Filtered sensitive storage key: {}", key)
                     continue
 
                 filtered_storage.append(item)
@@ -156,16 +200,24 @@ class SecureSessionStorage:
             # Filter sensitive data
             filtered_data = self.filter_sensitive_session_data(session_data)
 
-            # Convert to JSON
-            json_data = json.dumps(filtered_data, indent=2)
+            # Convert to compact JSON bytes (less plaintext to encrypt)
+            json_bytes = orjson.dumps(filtered_data)
 
             # Encrypt the data
-            encrypted_data = self._encrypt_data(json_data)
+            encrypted_data = self._encrypt_data(json_bytes)
 
-            # Save to file
+            # Save atomically: write a private temp file, then swap it in
             session_file = self.sessions_dir / f"{domain}.json"
-            with open(session_file, 'w', encoding='utf-8') as f:
-                f.write(encrypted_data)
+            tmp_file = session_file.with_suffix(".json.tmp")
+            fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_CLOEXEC, 0o600)
+            try:
+                view = memoryview(encrypted_data.encode())
+                while view:
+                    view = view[os.write(fd, view):]
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+            os.replace(tmp_file, session_file)
 
             logger.info(f"🔐 Securely saved session for {domain}")
 
@@ -195,7 +247,7 @@ class SecureSessionStorage:
             json_data = self._decrypt_data(encrypted_data)
 
             # Parse JSON
-            return json.loads(json_data)
+            return orjson.loads(json_data)
 
         except Exception as e:
             logger.error(f"Failed to load session for {domain}: {e}")
@@ -214,7 +266,8 @@ class SecureSessionStorage:
     def list_sessions(self) -> list:
         """List all stored session domains."""
         try:
-            return [f.stem for f in self.sessions_dir.glob("*.json")]
+            with os.scandir(self.sessions_dir) as entries:
+                return [e.name[:-5] for e in entries if e.name.endswith(".json") and e.is_file()]
         except Exception as e:
             logger.error(f"Failed to list sessions: {e}")
             return []
\ No newline at end of file
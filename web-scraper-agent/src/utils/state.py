@@ -2,7 +2,7 @@
 from dataclasses import dataclass, field
 import time
 
-@dataclass
+@dataclass(slots=True)
 class AgentState:
     url: str
     task: str
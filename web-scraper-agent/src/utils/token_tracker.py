@@ -1,15 +1,82 @@
+from functools import lru_cache
+import threading
 import tiktoken
 
+
+_COUNT_CACHE_SIZE = 10_000
+
+
+# Models we use -> BPE name; anything else goes through tiktoken's own table
+_MODEL_ENCODINGS = {
+    "gpt-4o-mini": "o200k_base",
+    "gpt-4o": "o200k_base",
+    "gpt-4-turbo": "cl100k_base",
+    "gpt-4": "cl100k_base",
+    "gpt-3.5-turbo": "cl100k_base",
+}
+
+
+@lru_cache(maxsize=8)
+def _get_encoding(model: str) -> tiktoken.Encoding:
+    # One Encoding per model, shared by every tracker in the process
+    name = _MODEL_ENCODINGS.get(model)
+    if name is not None:
+        return tiktoken.get_encoding(name)
+    return tiktoken.encoding_for_model(model)  # Raises KeyError for unknown models
+
+
+@lru_cache(maxsize=_COUNT_CACHE_SIZE)
+def _count_tokens(encoding: tiktoken.Encoding, text: str) -> int:
+    # Keyed on the text itself, so hash collisions can't share a count.
+    # Plain text, no special-token scan (scraped pages may contain "<|endoftext|>")
+    return len(encoding.encode_ordinary(text))
+
+
 class TokenTracker:
     def __init__(self, model: str = "gpt-4o-mini"):
-        self.encoding = tiktoken.encoding_for_model(model)
-        self.total = 0
+        self.encoding = _get_encoding(model)
+        # Per-thread [count] cells: concurrent counters never write the same
+        # attribute; `total` sums the cells (they outlive their threads)
+        self._local = threading.local()
+        self._cells: list[list[int]] = []
+        self._cells_lock = threading.Lock()
+
+    def _cell(self) -> list[int]:
+        cell = getattr(self._local, "cell", None)
+        if cell is None:
+            cell = self._local.cell = [0]
+            with self._cells_lock:
+                self._cells.append(cell)
+        return cell
+
+    @property
+    def total(self) -> int:
+        return sum(cell[0] for cell in self._cells)
 
     def count(self, text: str) -> int:
-        tokens = len(self.encoding.encode(text))
-        self.total += tokens
+        # Repeated prompts/boilerplate skip tiktoken entirely
+        tokens = _count_tokens(self.encoding, text)
+        self._cell()[0] += tokens
         return tokens
 
+    def count_many(self, texts: list[str]) -> list[int]:
+        # One batch call tokenizes in parallel on the Rust side;
+        # no more threads than texts
+        batch = self.encoding.encode_ordinary_batch(texts, num_threads=max(1, min(8, len(texts))))
+        counts = [len(tokens) for tokens in batch]
+        self._cell()[0] += sum(counts)
+        return counts
+
+    def count_if_near(self, text: str, budget: int) -> int | None:
+        """
+        Token count for budget gating, without touching the running total.
+        Returns None when text certainly fits: byte-level BPE never yields more
+        tokens than UTF-8 bytes, so only texts that could exceed budget are encoded.
+        """
+        if len(text) * 4 <= budget or len(text.encode("utf-8")) <= budget:
+            return None
+        return len(self.encoding.encode_ordinary(text))
+
     def print_summary(self, start_time: float):
         import time
         elapsed = time.time() - start_time
@@ -1,85 +1,146 @@
-import ast, asyncio, subprocess
+import ast, asyncio, json, os, sys
 from pathlib import Path
 from loguru import logger
 
-class ScriptValidator:
-    @staticmethod
-    def check_syntax(script_path: Path) -> tuple[bool, str]:
-        try:
-            ast.parse(script_path.read_text())
-            return True, "Syntax OK"
-        except SyntaxError as e:
-            return False, f"Syntax error: {e}"
+_WORKER_PATH = Path(__file__).with_name("script_worker.py")
 
-    @staticmethod
-    async def run_and_verify(script_path: Path, timeout: int = 60) -> tuple[bool, str]:
-        """Run script and verify data was created."""
-        logger.info("🧪 Testing script...")
+# Lets subprocess take its posix_spawn fast path (CPython 3.11 requires an
+# executable path with a directory part and close_fds=False). Python fds are
+# non-inheritable by default (PEP 446), so nothing leaks into the child.
+_SPAWN_KWARGS = {"close_fds": False}
+
+# Where generated scripts write their output (workspace data and scripts/data)
+_DATA_DIRS = ("data", os.path.join("scripts", "data"))
+_DATA_SUFFIXES = (".json", ".csv")
+_PREVIEW_BYTES = 4096
+
+
+def _latest_data_file():
+    """Newest .json/.csv entry across _DATA_DIRS (one scandir pass, one stat per match)."""
+    best, best_mtime = None, -1.0
+    for directory in _DATA_DIRS:
         try:
-            proc = await asyncio.create_subprocess_exec(
-                sys.executable, str(script_path),
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.name.endswith(_DATA_SUFFIXES):
+                        mtime = entry.stat().st_mtime
+                        if mtime > best_mtime:
+                            best, best_mtime = entry, mtime
+        except FileNotFoundError:
+            continue
+    return best
+
+
+def _read_preview(path: str) -> str:
+    """First _PREVIEW_BYTES of a data file, decoded leniently (may cut a character)."""
+    with open(path, "rb") as f:
+        return f.read(_PREVIEW_BYTES).decode("utf-8", "replace")
+
+
+class _ScriptWorker:
+    """One persistent script_worker.py child; respawned after a timeout or crash."""
+
+    def __init__(self):
+        self.proc = None
+        self.loop = None
+        self.lock = asyncio.Lock()
+
+    async def _ensure_started(self):
+        loop = asyncio.get_running_loop()
+        if self.proc is None or self.proc.returncode is not None or self.loop is not loop:
+            self.proc = await asyncio.create_subprocess_exec(
+                sys.executable, "-u", str(_WORKER_PATH),
+                stdin=asyncio.subprocess.PIPE,
                 stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
+                stderr=asyncio.subprocess.DEVNULL,
+                limit=2**24,  # Replies carry the whole script output on one line
+                **_SPAWN_KWARGS
             )
-            stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=timeout)
-            output = stderr.decode() + stdout.decode()
-            if proc.returncode != 0:
-                return False, f"Runtime error: {output}"
-            
-            # Check data file exists (check both workspace data and scripts/data)
-            data_files = list(Path("data").glob("*.json")) + list(Path("data").glob("*.csv"))
-            data_files += list((Path("scripts") / "data").glob("*.json")) + list((Path("scripts") / "data").glob("*.csv"))
-            if not data_files:
-                return False, "No data files created"
-            
-            latest = max(data_files, key=lambda f: f.stat().st_mtime)
-            if latest.stat().st_size < 10:
-                return False, "Data file is empty"
-                
-            logger.success(f"✅ Script test passed – {latest.name}")
-            return True, latest.read_text()
-        except asyncio.TimeoutError:
-            return False, "Script timed out after 60s"
-        except Exception as e:
-            return False, f"Unexpected error: {str(e)}" 
-import ast, asyncio, subprocess
-from pathlib import Path
-from loguru import logger
+            self.loop = loop
+        return self.proc
+
+    def _discard(self):
+        try:
+            if self.proc is not None and self.proc.returncode is None:
+                self.proc.kill()
+        except (ProcessLookupError, RuntimeError):  # Already gone / loop closed
+            pass
+        self.proc = None
+
+    async def run(self, script_path: Path, timeout: int) -> tuple[int, str]:
+        async with self.lock:
+            proc = await self._ensure_started()
+            try:
+                proc.stdin.write((json.dumps({"path": str(script_path)}) + "\n").encode())
+                await proc.stdin.drain()
+                line = await asyncio.wait_for(proc.stdout.readline(), timeout=timeout)
+                if not line:  # Script ended the worker (os._exit, segfault, ...)
+                    returncode = await asyncio.wait_for(proc.wait(), timeout=timeout)
+            except BaseException:
+                self._discard()  # Still busy with (or stuck in) this script
+                raise
+            if not line:
+                self._discard()
+                # Same verdict as a fresh interpreter: os._exit(0) is a clean exit
+                if returncode == 0:
+                    return 0, ""
+                return returncode, "Script worker exited while running the script"
+            reply = json.loads(line)
+            return reply["returncode"], reply["output"]
+
+
+_worker = _ScriptWorker()
+
 
 class ScriptValidator:
     @staticmethod
-    def check_syntax(script_path: Path) -> tuple[bool, str]:
+    async def check_syntax(script_path: Path) -> tuple[bool, str]:
         try:
-            ast.parse(script_path.read_text())
+            # Raw bytes: the parser decodes them itself (honouring any coding cookie)
+            source = await asyncio.to_thread(script_path.read_bytes)  # Keep file I/O off the event loop
+            ast.parse(source, filename=str(script_path))
             return True, "Syntax OK"
         except SyntaxError as e:
             return False, f"Syntax error line {e.lineno}: {e.msg}"
 
+    @staticmethod
+    async def _run_subprocess(script_path: Path, timeout: int) -> tuple[int, str]:
+        """Fallback: run the script in a fresh interpreter."""
+        proc = await asyncio.create_subprocess_exec(
+            sys.executable, str(script_path),
+            stdout=asyncio.subprocess.DEVNULL,  # Progress output is never inspected
+            stderr=asyncio.subprocess.PIPE,
+            **_SPAWN_KWARGS
+        )
+        _, stderr = await asyncio.wait_for(proc.communicate(), timeout=timeout)
+        if proc.returncode != 0:
+            return proc.returncode, stderr.decode("utf-8", "replace")
+        return 0, ""
+
     @staticmethod
     async def run_and_verify(script_path: Path, timeout: int = 60) -> tuple[bool, str]:
-        """Run script and verify data was created."""
+        """Run script and verify data was created; on success returns a preview of the newest data file."""
         logger.info("🧪 Testing script...")
         try:
-            proc = await asyncio.create_subprocess_exec(
-                "python", str(script_path),
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=timeout)
-            
-            if proc.returncode != 0:
-                return False, f"Runtime error: {stderr.decode()}"
-            
-            data_files = list(Path("data").glob("*.json")) + list(Path("data").glob("*.csv"))
-            data_files += list((Path("scripts") / "data").glob("*.json")) + list((Path("scripts") / "data").glob("*.csv"))
-            if not data_files:
+            try:
+                returncode, output = await _worker.run(script_path, timeout)
+            except asyncio.TimeoutError:  # A subclass of OSError on 3.11+; never re-run a hung script
+                raise
+            except OSError as e:
+                logger.warning("⚠️  Script worker unavailable ({}), using a fresh interpreter", e)
+                returncode, output = await ScriptValidator._run_subprocess(script_path, timeout)
+
+            if returncode != 0:
+                return False, f"Runtime error: {output}"
+
+            latest = _latest_data_file()
+            if latest is None:
                 return False, "No data files created"
-            
-            latest = max(data_files, key=lambda f: f.stat().st_mtime)
-            if latest.stat().st_size < 10:
+
+            if latest.stat().st_size < 10:  # DirEntry caches the stat from the scan
                 return False, "Data file empty"
-                
+
             logger.success(f"✅ Script test passed – {latest.name}")
-            return True, latest.read_text()
+            return True, await asyncio.to_thread(_read_preview, latest.path)
         except asyncio.TimeoutError:
-            return False, "Script timed out after 60s"
\ No newline at end of file
+            return False, "Script timed out after 60s"
@@ -0,0 +1,85 @@
+# src/validators/script_worker.py
+"""
+Long-lived runner for generated scripts, driven by ScriptValidator.
+
+Reads one JSON request per line on stdin ({"path": "..."}), runs the script
+in-process as __main__ and answers with one JSON line ({"returncode": int,
+"output": str}; output is only filled in on failure). Keeps interpreter
+startup and heavy imports (playwright, etc.) off every validation after the
+first.
+
+Scripts are not isolated from each other: sys.modules, module-level state,
+environment changes and any threads a script leaves running carry over to the
+next one. argv, sys.path, the working directory and stdin are reset per run;
+ScriptValidator respawns the worker after a timeout or crash.
+"""
+import io
+import json
+import os
+import runpy
+import sys
+import traceback
+from contextlib import redirect_stderr, redirect_stdout
+
+
+def _print_script_traceback(path: str):
+    """Print the current exception, dropping the worker/runpy frames above the script."""
+    exc = sys.exc_info()[1]
+    script = os.path.abspath(path)
+    tb = exc.__traceback__
+    while tb is not None and os.path.abspath(tb.tb_frame.f_code.co_filename) != script:
+        tb = tb.tb_next
+    # No script frame (e.g. a SyntaxError from compiling it): the message alone says where
+    traceback.print_exception(type(exc), exc, tb)
+
+
+def _run(path: str) -> dict:
+    buffer = io.StringIO()
+    cwd, argv, sys_path, stdin = os.getcwd(), sys.argv, sys.path[:], sys.stdin
+    sys.argv = [path]
+    sys.path.insert(0, os.path.dirname(os.path.abspath(path)))  # Same as `python script.py`
+    sys.stdin = null_stdin = open(os.devnull, encoding="utf-8")  # input() gets EOF instead of the protocol
+    returncode = 0
+    try:
+        with redirect_stdout(buffer), redirect_stderr(buffer):
+            try:
+                runpy.run_path(path, run_name="__main__")
+            except SystemExit as e:
+                if isinstance(e.code, int):
+                    returncode = e.code
+                elif e.code is not None:
+                    print(e.code, file=sys.stderr)
+                    returncode = 1
+            except BaseException:
+                _print_script_traceback(path)
+                returncode = 1
+    finally:
+        os.chdir(cwd)
+        null_stdin.close()
+        sys.argv, sys.path[:], sys.stdin = argv, sys_path, stdin
+    # Output only matters for reporting a failure; don't ship it otherwise
+    return {"returncode": returncode, "output": buffer.getvalue() if returncode else ""}
+
+
+def main():
+    # Answer on a private copy of stdout; anything written straight to fd 1
+    # (C extensions, child processes) goes to stderr instead of the protocol
+    channel = os.fdopen(os.dup(1), "w", encoding="utf-8")
+    os.dup2(2, 1)
+    # Likewise read requests from a private copy of stdin, leaving fd 0 on
+    # /dev/null so nothing a script runs can consume the next request
+    requests = os.fdopen(os.dup(0), encoding="utf-8")
+    devnull = os.open(os.devnull, os.O_RDONLY)
+    os.dup2(devnull, 0)
+    os.close(devnull)
+
+    for line in requests:
+        if not line.strip():
+            continue
+        request = json.loads(line)
+        channel.write(json.dumps(_run(request["path"])) + "\n")
+        channel.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -17,9 +17,19 @@ sys.path.append(str(Path(__file__).parent))
 warnings.filterwarnings("ignore", message="pkg_resources is deprecated")
 warnings.filterwarnings("ignore", message="Caught.*compiling regex")
 
-from playwright.async_api import async_playwright
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+from src.browser_pool import get_browser
 from src.frameworks.detector import FrameworkDetector
 
+# Detection only reads HTML, headers and JS globals; these bytes are never looked at
+_BLOCKED_RESOURCE_TYPES = frozenset({"image", "media", "font"})
+
+async def _block_heavy_resources(route):
+    if route.request.resource_type in _BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
 class TechStackTester:
     def __init__(self):
         self.test_cases = [
@@ -105,99 +115,118 @@ class TechStackTester:
             }
         ]
     
-    async def test_single_website(self, url: str, name: str, expected: list):
-        """Test tech stack detection for a single URL."""
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            page = await browser.new_page()
-            
-            print(f"\n{'='*60}")
-            print(f"🌐 Testing: {name}")
-            print(f"📎 URL: {url}")
-            
+    async def test_single_website(self, browser, url: str, name: str, expected: list):
+        """Test tech stack detection for a single URL in its own browser context."""
+        context = await browser.new_context()
+        await context.route("**/*", _block_heavy_resources)
+        await FrameworkDetector.install_tech_probe(context)
+        page = await context.new_page()
+
+        # Tests run concurrently, so buffer this test's output and print it in one block
+        out = [f"\n{'='*60}", f"🌐 Testing: {name}", f"📎 URL: {url}"]
+
+        try:
+            # Set reasonable timeout
+            await page.goto(url, wait_until="domcontentloaded", timeout=15000)
+            # Give late framework scripts a short chance to run instead of waiting for networkidle
             try:
-                # Set reasonable timeout
-                await page.goto(url, wait_until="networkidle", timeout=30000)
-                
-                # Get tech stack analysis
-                tech_info = await FrameworkDetector._analyze_tech_stack(page)
-                summary = FrameworkDetector._format_tech_summary(tech_info)
-                
-                # Print results
-                print(f"📊 DETECTION RESULT: {summary}")
-                
-                # Check if expected keywords are found
-                found_keywords = []
-                missing_keywords = []
-                
-                for keyword in expected:
-                    if keyword.lower() in summary.lower():
-                        found_keywords.append(keyword)
-                    else:
-                        missing_keywords.append(keyword)
-                
-                # Print validation
-                if found_keywords:
-                    print(f"✅ Found expected: {', '.join(found_keywords)}")
-                
-                if missing_keywords:
-                    print(f"❌ Missing expected: {', '.join(missing_keywords)}")
-                
-                # Show detected technologies from Wappalyzer
-                if tech_info.get("wappalyzer"):
-                    tech_list = list(tech_info["wappalyzer"])
-                    if tech_list:
-                        print(f"🔧 Wappalyzer detected: {', '.join(sorted(tech_list)[:10])}{'...' if len(tech_list) > 10 else ''}")
-                
-                # Show some raw detection flags
-                interesting_flags = {
-                    "react": tech_info.get("react"),
-                    "vue": tech_info.get("vue"),
-                    "angular": tech_info.get("angular"),
-                    "nextjs": tech_info.get("nextjs"),
-                    "nuxt": tech_info.get("nuxt"),
-                    "script_count": tech_info.get("script_count"),
-                    "is_static": tech_info.get("is_static"),
-                    "cached": tech_info.get("cached"),
-                }
-                print(f"📈 Key flags: {interesting_flags}")
-                
-                return True, summary
-                
-            except Exception as e:
-                print(f"❌ ERROR: {str(e)[:100]}")
-                return False, str(e)
-                
-            finally:
-                await browser.close()
-    
+                await page.wait_for_load_state("load", timeout=5000)
+            except PlaywrightTimeoutError:
+                pass
+
+            # Get tech stack analysis
+            tech_info = await FrameworkDetector._analyze_tech_stack(page)
+            summary = FrameworkDetector._format_tech_summary(tech_info)
+
+            # Print results
+            out.append(f"📊 DETECTION RESULT: {summary}")
+
+            # Check if expected keywords are found
+            found_keywords = []
+            missing_keywords = []
+
+            for keyword in expected:
+                if keyword.lower() in summary.lower():
+                    found_keywords.append(keyword)
+                else:
+                    missing_keywords.append(keyword)
+
+            # Print validation
+            if found_keywords:
+                out.append(f"✅ Found expected: {', '.join(found_keywords)}")
+
+            if missing_keywords:
+                out.append(f"❌ Missing expected: {', '.join(missing_keywords)}")
+
+            # Show detected technologies from Wappalyzer
+            if tech_info.get("wappalyzer"):
+                tech_list = list(tech_info["wappalyzer"])
+                if tech_list:
+                    out.append(f"🔧 Wappalyzer detected: {', '.join(sorted(tech_list)[:10])}{'...' if len(tech_list) > 10 else ''}")
+
+            # Show some raw detection flags
+            interesting_flags = {
+                "react": tech_info.get("react"),
+                "vue": tech_info.get("vue"),
+                "angular": tech_info.get("angular"),
+                "nextjs": tech_info.get("nextjs"),
+                "nuxt": tech_info.get("nuxt"),
+                "script_count": tech_info.get("script_count"),
+                "is_static": tech_info.get("is_static"),
+                "cached": tech_info.get("cached"),
+            }
+            out.append(f"📈 Key flags: {interesting_flags}")
+
+            return True, summary
+
+        except Exception as e:
+            out.append(f"❌ ERROR: {str(e)[:100]}")
+            return False, str(e)
+
+        finally:
+            print("\n".join(out))
+            await context.close()
+
     async def run_all_tests(self):
-        """Run all test cases."""
+        """Run all test cases against one shared browser, at most 8 at a time."""
         print("🚀 Starting FrameworkDetector Test Suite")
         print(f"📋 Testing {len(self.test_cases)} websites")
         print(f"{'='*60}")
-        
+
         results = []
         passed = 0
         failed = 0
-        
-        for test_case in self.test_cases:
-            success, result = await self.test_single_website(
-                test_case["url"],
-                test_case["name"],
-                test_case["expected"]
-            )
-            
+
+        async with async_playwright() as p:
+            browser = await get_browser(p)
+            semaphore = asyncio.Semaphore(8)
+
+            async def bounded(test_case):
+                async with semaphore:
+                    return await self.test_single_website(
+                        browser,
+                        test_case["url"],
+                        test_case["name"],
+                        test_case["expected"]
+                    )
+
+            try:
+                # A crash in one test (e.g. context creation) must not cancel the others
+                outcomes = await asyncio.gather(*[bounded(tc) for tc in self.test_cases], return_exceptions=True)
+            finally:
+                await browser.close()
+
+        for test_case, outcome in zip(self.test_cases, outcomes):
+            if isinstance(outcome, BaseException):
+                outcome = (False, str(outcome))
+            success, result = outcome
             if success:
                 passed += 1
                 results.append((test_case["name"], "PASS", result))
             else:
                 failed += 1
                 results.append((test_case["name"], "FAIL", result))
-            
-            # Small delay between tests
-            await asyncio.sleep(1)
-        
+
         # Print summary
         print(f"\n{'='*60}")
         print("📊 TEST SUMMARY")